@@ -1,4 +1,12 @@
 from argparse import *
 
 from .grid_argument_parser import GridArgumentParser
+from .compiled import CompiledGridParser, GridParseError, ParseResult
+from .diff import GridDiff, save_manifest
+from .grid import Grid
+from .index import GridIndex
+from .launch import LaunchEvent, format_command, launch_grid
+from .ranges import IntRange, LinearRange, LogRange
+from .search import GridSearchSession, Trial
 from .utils import list_as_delim_str, strbool
+from .workqueue import FileWorkQueue
@@ -0,0 +1,5 @@
+import sys
+
+from gridparse.cli import main
+
+sys.exit(main())
@@ -0,0 +1,380 @@
+import os
+import sys
+import json
+import shlex
+import asyncio
+import argparse
+import importlib
+from typing import (
+    AsyncIterable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Sized,
+    Tuple,
+    Union,
+)
+
+from gridparse.grid import Grid
+from gridparse.launch import launch_grid
+from gridparse.workqueue import FileWorkQueue
+
+
+def load_parser(spec: str):
+    """Loads a `GridArgumentParser` from `module:function`
+    (or `path/to/file.py:function`), where the function
+    takes no arguments and returns the parser."""
+    from gridparse.grid_argument_parser import GridArgumentParser
+
+    module_name, sep, function_name = spec.rpartition(":")
+    if not sep or not module_name or not function_name:
+        raise ValueError(f"Expected `module:function`, got {spec!r}.")
+
+    if module_name.endswith(".py"):
+        sys.path.insert(0, os.path.dirname(os.path.abspath(module_name)))
+        module_name = os.path.splitext(os.path.basename(module_name))[0]
+    elif os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    module = importlib.import_module(module_name)
+    parser = getattr(module, function_name)()
+    if not isinstance(parser, GridArgumentParser):
+        raise TypeError(
+            f"{spec} returned {type(parser).__name__}, "
+            "not a GridArgumentParser."
+        )
+    return parser
+
+
+def shard_indices(n: int, num_shards: int, shard_index: int) -> range:
+    """Indices of the configurations in a shard. Shards are strided so that
+    they get a similar share of each `{}` subspace."""
+    if not 0 <= shard_index < num_shards:
+        raise ValueError("Shard index must be in [0, num_shards).")
+    return range(shard_index, n, num_shards)
+
+
+def format_namespace(namespace: argparse.Namespace, fmt: str, parser) -> str:
+    """Formats a configuration for printing."""
+    if fmt == "json":
+        return json.dumps(vars(namespace), default=str)
+    if fmt == "argv":
+        return " ".join(shlex.quote(a) for a in parser.to_argv(namespace))
+    return repr(namespace)
+
+
+def read_state(path: str, argv: List[str], size: int) -> Set[int]:
+    """Returns the indices of the configurations that have finished
+    successfully in a previous run of the same grid, and starts the
+    state file with the grid if it is new.
+
+    Raises:
+        ValueError: if the state file is of a different grid.
+    """
+    header = dict(argv=list(argv), size=size)
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        with open(path, "w") as fp:
+            fp.write(json.dumps(header) + "\n")
+        return set()
+
+    done = set()
+    with open(path) as fp:
+        try:
+            recorded = json.loads(fp.readline())
+        except json.JSONDecodeError:
+            recorded = None
+        if not isinstance(recorded, dict) or "size" not in recorded:
+            raise ValueError(f"{path} is not a state file of gridparse.")
+        if recorded["argv"] != header["argv"] or recorded["size"] != size:
+            raise ValueError(
+                f"{path} is the state of a different grid "
+                f"({recorded['size']} configurations from "
+                f"`{' '.join(recorded['argv'])}`), not resuming."
+            )
+
+        for line in fp:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # interrupted while writing
+                continue
+            if record["returncode"] == 0:
+                done.add(record["index"])
+    return done
+
+
+async def run_grid(
+    parser,
+    grid: Grid,
+    template: List[str],
+    indices: Union[Iterable[int], AsyncIterable[int]],
+    workers: int,
+    cpus_per_worker: Optional[int] = None,
+    state: Optional[str] = None,
+    queue: Optional[FileWorkQueue] = None,
+) -> Tuple[int, int]:
+    """Runs `template` for the configurations in `indices`
+    of the grid of `parser`, recording completions in `state`
+    and in `queue` (which `indices` are usually claimed from).
+
+    Returns:
+        The number of successful and failed configurations.
+    """
+    total = f"/{len(indices)}" if isinstance(indices, Sized) else ""
+    succeeded, failed = 0, 0
+    fp = open(state, "a") if state is not None else None
+    try:
+        async for event in launch_grid(
+            grid,
+            template,
+            concurrency=workers,
+            cpus_per_slot=cpus_per_worker,
+            indices=indices,
+            parser=parser,
+        ):
+            if event.returncode == 0:
+                succeeded += 1
+            else:
+                failed += 1
+
+            if fp is not None:
+                record = dict(index=event.index, returncode=event.returncode)
+                fp.write(json.dumps(record) + "\n")
+                fp.flush()
+
+            if queue is not None:
+                queue.complete(event.index, event.returncode)
+
+            status = event.error or f"exit code {event.returncode}"
+            print(
+                f"[{succeeded + failed}{total}] configuration "
+                f"{event.index}: {status} "
+                f"({event.finished - event.started:.1f}s)",
+                flush=True,
+            )
+    finally:
+        if fp is not None:
+            fp.close()
+
+    return succeeded, failed
+
+
+def build_cli() -> argparse.ArgumentParser:
+    cli = argparse.ArgumentParser(
+        prog="gridparse",
+        description="Expand and run grids of a GridArgumentParser. "
+        "Options of each mode go before the parser, "
+        "and the arguments of the grid after it.",
+    )
+    modes = cli.add_subparsers(dest="mode", required=True)
+
+    def add_parser_args(mode):
+        mode.add_argument(
+            "parser",
+            help="`module:function` that returns the GridArgumentParser.",
+        )
+        mode.add_argument(
+            "args",
+            nargs=argparse.REMAINDER,
+            help="Arguments of the grid.",
+        )
+
+    def add_shard_args(mode, required):
+        mode.add_argument("--num-shards", type=int, required=required)
+        mode.add_argument("--shard-index", type=int, required=required)
+
+    def add_format_args(mode):
+        mode.add_argument(
+            "--format",
+            choices=["repr", "json", "argv"],
+            default="repr",
+            help="How to print each configuration.",
+        )
+        mode.add_argument(
+            "--indices",
+            action="store_true",
+            help="Print the index of each configuration instead.",
+        )
+
+    count = modes.add_parser(
+        "count", help="Print the number of configurations."
+    )
+    add_parser_args(count)
+
+    list_ = modes.add_parser("list", help="Print the configurations.")
+    add_format_args(list_)
+    add_parser_args(list_)
+
+    shard = modes.add_parser(
+        "shard", help="Print the configurations of a shard."
+    )
+    add_shard_args(shard, required=True)
+    add_format_args(shard)
+    add_parser_args(shard)
+
+    run = modes.add_parser(
+        "run",
+        help="Run a command for each configuration on local workers. "
+        "The command follows `--` after the arguments of the grid, "
+        "and is formatted with the values of each configuration, "
+        "e.g. `-- python train.py --lr {lr}`, where `{argv}` is replaced "
+        "with all the arguments of the configuration.",
+    )
+    run.add_argument(
+        "--workers", type=int, default=1, help="Number of worker slots."
+    )
+    run.add_argument(
+        "--cpus-per-worker",
+        type=int,
+        help="Pin each worker to its own CPUs with `taskset`.",
+    )
+    run.add_argument(
+        "--state",
+        help="File to record finished configurations in. If it exists, "
+        "configurations that finished successfully are skipped, "
+        "as long as it is of the same grid arguments.",
+    )
+    add_shard_args(run, required=False)
+    add_parser_args(run)
+
+    work = modes.add_parser(
+        "work",
+        help="Like `run`, but pulls configurations from a work queue in a "
+        "shared directory, so that workers started on any number of nodes "
+        "share the grid until it is finished.",
+    )
+    work.add_argument(
+        "--queue",
+        required=True,
+        help="Shared directory of the queue, created if it doesn't exist.",
+    )
+    work.add_argument(
+        "--workers", type=int, default=1, help="Number of worker slots."
+    )
+    work.add_argument(
+        "--cpus-per-worker",
+        type=int,
+        help="Pin each worker to its own CPUs with `taskset`.",
+    )
+    work.add_argument(
+        "--lease-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds without heartbeats after which the configurations "
+        "of a worker are considered abandoned and claimed again.",
+    )
+    work.add_argument(
+        "--wait",
+        action="store_true",
+        help="Keep polling until all configurations are finished, to claim "
+        "those of workers that die, instead of stopping when nothing is "
+        "left to claim.",
+    )
+    add_parser_args(work)
+
+    return cli
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the `gridparse` command.
+
+    Examples:
+        ```
+        gridparse count train:build_parser --lr 0.1 0.01 --seed 0 1 2
+        gridparse list --format json train:build_parser --lr 0.1 0.01
+        gridparse shard --num-shards 4 --shard-index 0 train:build_parser --lr 0.1 0.01
+        gridparse run --workers 4 --state sweep.jsonl train:build_parser \\
+            --lr 0.1 0.01 -- python train.py --lr {lr}
+        gridparse work --queue /shared/sweep --workers 4 train:build_parser \\
+            --lr 0.1 0.01 -- python train.py --lr {lr}
+        ```
+    """
+    cli = build_cli()
+    args = cli.parse_args(argv)
+
+    template = None
+    grid_args = args.args
+    if args.mode in ("run", "work"):
+        if "--" not in grid_args:
+            cli.error(f"{args.mode}: missing `-- <command template>`")
+        i = grid_args.index("--")
+        grid_args, template = grid_args[:i], grid_args[i + 1 :]
+        if not template:
+            cli.error(f"{args.mode}: empty command template")
+
+    try:
+        parser = load_parser(args.parser)
+    except (ValueError, TypeError, ImportError, AttributeError) as err:
+        cli.error(str(err))
+
+    grid = parser.parse_grid(grid_args)
+
+    if args.mode == "count":
+        print(len(grid))
+        return 0
+
+    if args.mode == "work":
+        try:
+            queue = FileWorkQueue(
+                args.queue,
+                grid,
+                lease_timeout=args.lease_timeout,
+                argv=grid_args,
+            )
+        except ValueError as err:
+            cli.error(str(err))
+        with queue:
+            _, failed = asyncio.run(
+                run_grid(
+                    parser,
+                    grid,
+                    template,
+                    queue.aclaims(wait=args.wait),
+                    workers=args.workers,
+                    cpus_per_worker=args.cpus_per_worker,
+                    queue=queue,
+                )
+            )
+        return 1 if failed else 0
+
+    indices = range(len(grid))
+    num_shards = getattr(args, "num_shards", None)
+    shard_index = getattr(args, "shard_index", None)
+    if (num_shards is None) != (shard_index is None):
+        cli.error("--num-shards and --shard-index must be given together")
+    if num_shards is not None:
+        try:
+            indices = shard_indices(
+                len(grid), args.num_shards, args.shard_index
+            )
+        except ValueError as err:
+            cli.error(str(err))
+
+    if args.mode in ("list", "shard"):
+        for i in indices:
+            if args.indices:
+                print(i)
+            else:
+                print(format_namespace(grid[i], args.format, parser))
+        return 0
+
+    if args.state is not None:
+        try:
+            done = read_state(args.state, grid_args, len(grid))
+        except ValueError as err:
+            cli.error(str(err))
+        indices = [i for i in indices if i not in done]
+
+    _, failed = asyncio.run(
+        run_grid(
+            parser,
+            grid,
+            template,
+            indices,
+            workers=args.workers,
+            cpus_per_worker=args.cpus_per_worker,
+            state=args.state,
+        )
+    )
+    return 1 if failed else 0
@@ -0,0 +1,202 @@
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+from gridparse.grid import Grid
+
+
+class GridParseError(Exception):
+    """Error of a `CompiledGridParser`, raised where
+    `argparse` would print a message and exit.
+
+    Attributes:
+        message: the error message.
+        status: the exit status `argparse` would have used.
+        prog: the program name of the (sub)parser that failed.
+    """
+
+    def __init__(self, message: str, status: int = 2, prog: str = ""):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.prog = prog
+
+    def to_dict(self) -> dict:
+        """Returns the error as a JSON-serializable dictionary."""
+        return dict(message=self.message, status=self.status, prog=self.prog)
+
+
+class ParseResult(NamedTuple):
+    """Result of a single command line in `CompiledGridParser.parse_many`.
+
+    Attributes:
+        argv: the command-line arguments.
+        grid: the lazy grid, `None` if parsing failed.
+        error: why parsing failed, if it did.
+    """
+
+    argv: List[str]
+    grid: Optional[Grid] = None
+    error: Optional[GridParseError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _walk_parsers(parser: argparse.ArgumentParser) -> Iterator:
+    """Yields `parser` and all its subparsers, once each."""
+    seen = set()
+    stack = [parser]
+    while stack:
+        parser = stack.pop()
+        if id(parser) in seen:
+            continue
+        seen.add(id(parser))
+        yield parser
+        for action in parser._actions:
+            if isinstance(action, argparse._SubParsersAction):
+                stack.extend(action.choices.values())
+
+
+def _raise_error(parser: argparse.ArgumentParser, message: str):
+    raise GridParseError(message, status=2, prog=parser.prog)
+
+
+def _raise_exit(
+    parser: argparse.ArgumentParser,
+    status: int = 0,
+    message: Optional[str] = None,
+):
+    raise GridParseError(
+        (message or "").strip() or f"exited with status {status}",
+        status=status,
+        prog=parser.prog,
+    )
+
+
+class CompiledGridParser:
+    """Immutable snapshot of a `GridArgumentParser` that can parse from
+    many threads concurrently, e.g. in a service that validates grids.
+
+    Created with `GridArgumentParser.compile`. The parser is copied, so
+    arguments added to the original afterwards have no effect, and the
+    tables that argparse recomputes on every call (mutually exclusive
+    arguments, positionals, the formatting of `to_argv`) are computed
+    once (the latter on the first call to `to_argv`, so that compiling
+    never runs `type` functions). Errors raise `GridParseError` instead of
+    printing the usage and calling `sys.exit`, and nothing is printed
+    (including `--help`).
+
+    Example:
+        ```
+        compiled = parser.compile()
+        for result in compiled.parse_many(list_of_argv, max_workers=8):
+            if result.ok:
+                print(len(result.grid))
+            else:
+                print(result.error.to_dict())
+        ```
+
+    Args:
+        parser: the `GridArgumentParser` to compile.
+    """
+
+    def __init__(self, parser: argparse.ArgumentParser):
+        parser = deepcopy(parser)
+        for p in _walk_parsers(parser):
+            # the copy may hold formatting functions of the original
+            vars(p).pop("_argv_cache", None)
+            p.error = _raise_error.__get__(p)
+            p.exit = _raise_exit.__get__(p)
+            p._print_message = lambda message, file=None: None
+            p._freeze()
+        self._parser = parser
+
+        self._argv_lock = threading.Lock()
+        self._argv_ready = False
+
+    @property
+    def prog(self) -> str:
+        return self._parser.prog
+
+    def format_usage(self) -> str:
+        return self._parser.format_usage()
+
+    def format_help(self) -> str:
+        return self._parser.format_help()
+
+    def parse_grid(self, args: Sequence[str]) -> Grid:
+        """Like `GridArgumentParser.parse_grid`.
+
+        Raises:
+            GridParseError: if the arguments are invalid.
+        """
+        try:
+            return self._parser.parse_grid(list(args))
+        except argparse.ArgumentError as err:
+            # parsers with `exit_on_error=False` don't call `error`
+            raise GridParseError(str(err), prog=self._parser.prog) from err
+
+    def parse_args(self, args: Sequence[str]) -> List[argparse.Namespace]:
+        """Like `GridArgumentParser.parse_args`.
+
+        Raises:
+            GridParseError: if the arguments are invalid.
+        """
+        return list(self.parse_grid(args))
+
+    def parse_one(self, args: Sequence[str]) -> ParseResult:
+        """Parses a command line into a `ParseResult` instead of raising."""
+        args = list(args)
+        try:
+            return ParseResult(args, grid=self.parse_grid(args))
+        except GridParseError as err:
+            return ParseResult(args, error=err)
+
+    def parse_many(
+        self,
+        list_of_argv: Sequence[Sequence[str]],
+        max_workers: Optional[int] = None,
+    ) -> List[ParseResult]:
+        """Parses many command lines, one `ParseResult` per command line
+        in the same order, so that a bad command line does not affect
+        the rest.
+
+        Args:
+            list_of_argv: the command lines.
+            max_workers: if provided, parses in a thread pool
+                with this many threads.
+        """
+        if max_workers is None or max_workers <= 1:
+            return [self.parse_one(args) for args in list_of_argv]
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(self.parse_one, list_of_argv))
+
+    def _prepare_argv(self):
+        """Creates the formatting of `to_argv` of all parsers once,
+        so that calls from many threads only read it."""
+        if self._argv_ready:
+            return
+        with self._argv_lock:
+            if not self._argv_ready:
+                for parser in _walk_parsers(self._parser):
+                    parser._argv_fields()
+                self._argv_ready = True
+
+    def to_argv(self, namespace: argparse.Namespace) -> List[str]:
+        """Like `GridArgumentParser.to_argv`."""
+        self._prepare_argv()
+        return self._parser.to_argv(namespace)
+
+    def to_argv_many(
+        self, namespaces: Sequence[argparse.Namespace]
+    ) -> List[List[str]]:
+        """Like `GridArgumentParser.to_argv_many`."""
+        self._prepare_argv()
+        return self._parser.to_argv_many(namespaces)
+
+    def __repr__(self) -> str:
+        return f"CompiledGridParser(prog={self.prog!r})"
@@ -0,0 +1,166 @@
+import json
+import argparse
+from itertools import product
+from typing import (
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Sequence,
+)
+
+from gridparse.grid import Grid, GridBlock
+from gridparse.utils import _freeze
+
+
+def _block_key(block: GridBlock) -> Hashable:
+    """Identifies the blocks of two grids that can be compared value-wise:
+    same arguments outside the searchable ones, and same searchable ones."""
+    base = tuple(
+        (k, _freeze(v))
+        for k, v in sorted(block._base_attrs.items())
+        if k != "___specified_args___"
+    )
+    return base, tuple(dest for dest, _ in block.axes)
+
+
+def _boxes(others: Sequence[GridBlock], b: GridBlock) -> List[List[List[int]]]:
+    """Splits the configurations in `b` that are not in any of `others`,
+    blocks with the same key, into disjoint boxes: for each axis of `b`,
+    the positions of its values in the box.
+
+    Subtracts each block `A` from each box `B` with `B - A = U_k (B_1 & A_1)
+    x ... x (B_{k-1} & A_{k-1}) x (B_k - A_k) x B_{k+1} x ...`, a disjoint
+    union, so the cost depends on the number of axis values and boxes,
+    not on the number of configurations.
+    """
+    keys = [[_freeze(v) for v in values] for _, values in b.axes]
+    boxes = [[list(range(size)) for size in b.sizes]]
+    for a in others:
+        a_sets = [set(_freeze(v) for v in values) for _, values in a.axes]
+        remaining = []
+        for box in boxes:
+            shared: List[List[int]] = []
+            for k, positions in enumerate(box):
+                new = [p for p in positions if keys[k][p] not in a_sets[k]]
+                if new:
+                    remaining.append(shared + [new] + box[k + 1 :])
+                shared.append([p for p in positions if keys[k][p] in a_sets[k]])
+                if not shared[-1]:
+                    break
+        boxes = remaining
+    return boxes
+
+
+def _difference(others: Sequence[GridBlock], b: GridBlock) -> Iterator[int]:
+    """Yields the indices in `b` of the configurations that are not in any
+    of `others`, where the blocks have the same key."""
+    for box in _boxes(others, b):
+        for positions in product(*box):
+            yield b.index(positions)
+
+
+def _difference_size(others: Sequence[GridBlock], b: GridBlock) -> int:
+    """Number of indices `_difference` yields."""
+    size = 0
+    for box in _boxes(others, b):
+        box_size = 1
+        for positions in box:
+            box_size *= len(positions)
+        size += box_size
+    return size
+
+
+class GridDiff:
+    """Configurations added to and removed from a grid, computed over the
+    values of each searchable argument instead of the configurations.
+
+    The `{}` subspace paths of the two grids are matched by the values of
+    their non-searchable arguments. Within matched paths, only the values
+    of searchable arguments are compared, so the cost depends on the size
+    of the change and not the size of the grids. Note that configuration
+    files are compared by name, not by content.
+
+    Args:
+        old: the previous grid.
+        new: the current grid.
+    """
+
+    def __init__(self, old: Grid, new: Grid):
+        self.old = old
+        self.new = new
+
+        old_keys = [_block_key(block) for block in old.blocks]
+        new_keys = [_block_key(block) for block in new.blocks]
+        old_blocks: Dict[Hashable, List[int]] = {}
+        for i, key in enumerate(old_keys):
+            old_blocks.setdefault(key, []).append(i)
+        new_blocks: Dict[Hashable, List[int]] = {}
+        for j, key in enumerate(new_keys):
+            new_blocks.setdefault(key, []).append(j)
+
+        # all the blocks of the other grid with the same key, since a
+        # configuration can move between repeated subspaces
+        self.old_matches: List[List[int]] = [
+            new_blocks.get(key, []) for key in old_keys
+        ]
+        self.new_matches: List[List[int]] = [
+            old_blocks.get(key, []) for key in new_keys
+        ]
+
+    def added_indices(self) -> Iterator[int]:
+        """Yields the indices in the new grid of added configurations."""
+        for j, matches in enumerate(self.new_matches):
+            others = [self.old.blocks[i] for i in matches]
+            offset = self.new.offsets[j]
+            for k in _difference(others, self.new.blocks[j]):
+                yield offset + k
+
+    def removed_indices(self) -> Iterator[int]:
+        """Yields the indices in the old grid of removed configurations."""
+        for i, matches in enumerate(self.old_matches):
+            others = [self.new.blocks[j] for j in matches]
+            offset = self.old.offsets[i]
+            for k in _difference(others, self.old.blocks[i]):
+                yield offset + k
+
+    def added(self) -> Iterator[argparse.Namespace]:
+        """Yields the added configurations."""
+        for i in self.added_indices():
+            yield self.new[i]
+
+    def removed(self) -> Iterator[argparse.Namespace]:
+        """Yields the removed configurations."""
+        for i in self.removed_indices():
+            yield self.old[i]
+
+    def num_added(self) -> int:
+        """Number of added configurations, computed without enumerating them."""
+        return sum(
+            _difference_size(
+                [self.old.blocks[i] for i in matches], self.new.blocks[j]
+            )
+            for j, matches in enumerate(self.new_matches)
+        )
+
+    def num_removed(self) -> int:
+        """Number of removed configurations, computed without enumerating them."""
+        return sum(
+            _difference_size(
+                [self.new.blocks[j] for j in matches], self.old.blocks[i]
+            )
+            for i, matches in enumerate(self.old_matches)
+        )
+
+
+def save_manifest(path: str, args: Sequence[str]):
+    """Saves the command-line arguments of a grid, to compare
+    later grids against it with `GridArgumentParser.diff_grid`."""
+    with open(path, "w") as fp:
+        json.dump(dict(args=list(args)), fp)
+
+
+def load_manifest(path: str) -> List[str]:
+    """Loads the command-line arguments saved by `save_manifest`."""
+    with open(path) as fp:
+        return json.load(fp)["args"]
@@ -0,0 +1,210 @@
+import argparse
+from bisect import bisect_right
+from copy import deepcopy
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+
+class ZippedValues(Sequence):
+    """Values of searchable arguments that vary together, paired by
+    position, as a single axis of a `GridBlock`. Arguments with a single
+    value are paired with every value of the others.
+
+    Args:
+        values: the values of each argument.
+
+    Raises:
+        ValueError: if the arguments have different numbers of values.
+    """
+
+    def __init__(self, values: Sequence[Sequence]):
+        self.values = list(values)
+        lengths = set(len(v) for v in self.values if len(v) != 1)
+        if len(lengths) > 1:
+            raise ValueError(
+                "Zipped arguments have different numbers of values: "
+                + ", ".join(str(len(v)) for v in self.values)
+            )
+        self._len = lengths.pop() if lengths else 1
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("zipped index out of range")
+        return tuple(v[i] if len(v) != 1 else v[0] for v in self.values)
+
+    def __repr__(self) -> str:
+        return f"ZippedValues({self.values})"
+
+
+def _axis_dests(dest: Union[str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    """The arguments of an axis, which are many for zipped arguments."""
+    return dest if isinstance(dest, tuple) else (dest,)
+
+
+class GridBlock:
+    """Configurations produced by a single `{}` subspace path.
+
+    Holds the namespace that a single argparse pass produced for the path,
+    where searchable arguments still hold *all* their values, and exposes
+    the cartesian product of these values without building it. The first
+    searchable argument varies the fastest, which is the order in which
+    `GridArgumentParser` has always expanded namespaces.
+
+    Args:
+        base: namespace returned by argparse for the path.
+        axes: `(dest, values)` for every searchable argument in `base`,
+            where arguments zipped together share a single axis with
+            a tuple of their `dest`s and `ZippedValues`.
+    """
+
+    def __init__(
+        self, base: argparse.Namespace, axes: List[Tuple[str, Sequence]]
+    ):
+        self.base = base
+        self.axes = list(axes)
+        self.sizes = [len(values) for _, values in self.axes]
+
+        self._size = 1
+        for size in self.sizes:
+            self._size *= size
+
+        axis_dests = set(d for dest, _ in self.axes for d in _axis_dests(dest))
+        self._base_attrs = {
+            k: v for k, v in vars(base).items() if k not in axis_dests
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def positions(self, i: int) -> List[int]:
+        """Returns the position in each axis of the `i`-th configuration."""
+        positions = []
+        for size in self.sizes:
+            i, pos = divmod(i, size)
+            positions.append(pos)
+        return positions
+
+    def index(self, positions: Sequence[int]) -> int:
+        """Inverse of `positions`."""
+        i = 0
+        stride = 1
+        for pos, size in zip(positions, self.sizes):
+            i += pos * stride
+            stride *= size
+        return i
+
+    def values(self, i: int) -> List[Tuple[str, Any]]:
+        """Returns the `(dest, value)` pairs of the searchable arguments
+        of the `i`-th configuration."""
+        pairs = []
+        for (dest, values), pos in zip(self.axes, self.positions(i)):
+            if isinstance(dest, tuple):
+                pairs.extend(zip(dest, values[pos]))
+            else:
+                pairs.append((dest, values[pos]))
+        return pairs
+
+    def __getitem__(self, i: int) -> argparse.Namespace:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("block index out of range")
+
+        # searchable arguments are (re)set last, same as the eager expansion
+        namespace = argparse.Namespace(**deepcopy(self._base_attrs))
+        for dest, value in self.values(i):
+            setattr(namespace, dest, deepcopy(value))
+        return namespace
+
+    def __iter__(self) -> Iterator[argparse.Namespace]:
+        for i in range(self._size):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        axes = ", ".join(
+            f"{'+'.join(_axis_dests(dest))}={len(v)}" for dest, v in self.axes
+        )
+        return f"GridBlock({axes})"
+
+
+class Grid(Sequence):
+    """Lazy sequence of the namespaces described by a grid.
+
+    Returned by `GridArgumentParser.parse_grid`. Supports `len`, indexing
+    and slicing without expanding the grid, and yields the same namespaces,
+    in the same order, as `GridArgumentParser.parse_args`.
+
+    Args:
+        blocks: one block per `{}` subspace path.
+        finalize: called on every namespace before it is returned.
+    """
+
+    def __init__(
+        self,
+        blocks: List[GridBlock],
+        finalize: Optional[Callable[[argparse.Namespace], Any]] = None,
+    ):
+        self.blocks = []
+        for block in blocks:
+            subnamespaces = getattr(block.base, "___namespaces___", None)
+            if subnamespaces is None:
+                self.blocks.append(block)
+                continue
+            # namespaces of subparsers are already expanded,
+            # and each of them replaces the parent namespace
+            for _ in range(len(block)):
+                self.blocks.extend(GridBlock(ns, []) for ns in subnamespaces)
+
+        self.offsets = [0]
+        for block in self.blocks:
+            self.offsets.append(self.offsets[-1] + len(block))
+
+        self._finalize = finalize
+
+    def __len__(self) -> int:
+        return self.offsets[-1]
+
+    def locate(self, i: int) -> Tuple[int, int]:
+        """Returns the block of the `i`-th configuration
+        and its index within that block."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("grid index out of range")
+        b = bisect_right(self.offsets, i) - 1
+        return b, i - self.offsets[b]
+
+    def raw(self, i: int) -> argparse.Namespace:
+        """Returns the `i`-th namespace before it is finalized."""
+        b, j = self.locate(i)
+        return self.blocks[b][j]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        namespace = self.raw(i)
+        if self._finalize is not None:
+            namespace = self._finalize(namespace)
+        return namespace
+
+    def __iter__(self) -> Iterator[argparse.Namespace]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"Grid(len={len(self)}, blocks={self.blocks})"
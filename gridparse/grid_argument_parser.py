@@ -1,22 +1,188 @@
 import os
+import asyncio
 import argparse
 import warnings
-from typing import Any, Tuple, List, Optional, Union, Sequence
+from bisect import bisect_left, insort
+from types import SimpleNamespace
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Tuple,
+    List,
+    Optional,
+    Union,
+    Sequence,
+)
 from copy import deepcopy
+from functools import partial
 from omegaconf import OmegaConf
 
+from gridparse.compiled import CompiledGridParser
+from gridparse.diff import GridDiff, load_manifest
+from gridparse.grid import Grid, GridBlock, ZippedValues
+from gridparse.ranges import (
+    ValueChain,
+    ValueRange,
+    accepts_ranges,
+    parse_range,
+)
 from gridparse.utils import list_as_delim_str, strbool
 
 
+class _OptionIndex(dict):
+    """Mapping from option strings to actions that also keeps the option
+    strings sorted, so that the ones starting with a prefix are found
+    with a binary search instead of a scan over all of them."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._keys = []
+        self._order = {}
+        self._counter = 0
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            insort(self._keys, key)
+            self._order[key] = self._counter
+            self._counter += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        del self._keys[bisect_left(self._keys, key)]
+        del self._order[key]
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self._keys.clear()
+        self._order.clear()
+
+    def startswith(self, prefix: str) -> List[str]:
+        """Returns the option strings that start with `prefix`,
+        in the order they were added."""
+        keys = []
+        for i in range(bisect_left(self._keys, prefix), len(self._keys)):
+            if not self._keys[i].startswith(prefix):
+                break
+            keys.append(self._keys[i])
+        return sorted(keys, key=self._order.__getitem__)
+
+
+# a default that no value is the same as
+_NO_DEFAULT = object()
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    """Whether two values are equal and of the same type
+    (e.g., `1` is not the same as `True`)."""
+    return type(a) is type(b) and a == b
+
+
 class AuxArgumentParser(argparse.ArgumentParser):
     """Overwritten only to collect the argument names that
     are specified in the command line."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # groups share the mapping of the parser, so replace it everywhere
+        index = _OptionIndex(self._option_string_actions)
+        self._option_string_actions = index
+        for group in self._action_groups + self._mutually_exclusive_groups:
+            group._option_string_actions = index
+
+    def _get_option_tuples(self, option_string: str) -> List[tuple]:
+        """Overwritten to only consider the option strings that can match
+        `option_string`, found through the index of option strings.
+        Matching itself (abbreviations, ambiguities, etc.) is left
+        to `argparse`."""
+        index = self._option_string_actions
+        if not isinstance(index, _OptionIndex) or len(option_string) < 2:
+            return super()._get_option_tuples(option_string)
+
+        option_prefix = option_string.split("=", 1)[0]
+        candidates = index.startswith(option_prefix)
+
+        # single-dash options can be concatenated with their argument
+        short_option_prefix = option_string[:2]
+        if short_option_prefix in index and not short_option_prefix.startswith(
+            option_prefix
+        ):
+            candidates.append(short_option_prefix)
+            candidates.sort(key=index._order.__getitem__)
+
+        view = SimpleNamespace(
+            prefix_chars=self.prefix_chars,
+            allow_abbrev=self.allow_abbrev,
+            error=self.error,
+            _option_string_actions={c: index[c] for c in candidates},
+        )
+        return argparse.ArgumentParser._get_option_tuples(view, option_string)
+
+    def _action_tables(self) -> Tuple[dict, List[argparse.Action]]:
+        """Returns the mapping of mutually exclusive arguments to the
+        arguments they can't occur with, and the positional arguments.
+        Computed once if the parser is frozen (see `_freeze`)."""
+        tables = getattr(self, "_frozen_tables", None)
+        if tables is not None:
+            return tables
+
+        # map all mutually exclusive arguments to the other arguments
+        # they can't occur with
+        action_conflicts = {}
+        for mutex_group in self._mutually_exclusive_groups:
+            group_actions = mutex_group._group_actions
+            for i, mutex_action in enumerate(mutex_group._group_actions):
+                conflicts = action_conflicts.setdefault(mutex_action, [])
+                conflicts.extend(group_actions[:i])
+                conflicts.extend(group_actions[i + 1 :])
+
+        return action_conflicts, self._get_positional_actions()
+
+    def _freeze(self):
+        """Precomputes the tables of `_action_tables`, which are
+        then reused by every parse. Arguments must not be added after."""
+        self._frozen_tables = None
+        self._frozen_tables = self._action_tables()
+
     def parse_known_args(
         self, args=None, namespace=None
     ) -> Tuple[argparse.Namespace, List[str]]:
         """Overwritten to collect the argument names that
         are specified in the command line."""
+        return self._parse_known_with(self._parse_known_args, args, namespace)
+
+    def _parse_known_with(
+        self, parse_fn, args=None, namespace=None
+    ) -> Tuple[Any, List[str]]:
+        """Body of `parse_known_args`, with `parse_fn` in place
+        of `_parse_known_args`."""
         if args is None:
             # args default to the system args
             args = argparse._sys.argv[1:]
@@ -46,12 +212,12 @@ class AuxArgumentParser(argparse.ArgumentParser):
         # parse the arguments and exit if there are any errors
         if self.exit_on_error:
             try:
-                namespace, args = self._parse_known_args(args, namespace)
+                namespace, args = parse_fn(args, namespace)
             except argparse.ArgumentError:
                 err = argparse._sys.exc_info()[1]
                 self.error(str(err))
         else:
-            namespace, args = self._parse_known_args(args, namespace)
+            namespace, args = parse_fn(args, namespace)
 
         if hasattr(namespace, argparse._UNRECOGNIZED_ARGS_ATTR):
             args.extend(getattr(namespace, argparse._UNRECOGNIZED_ARGS_ATTR))
@@ -69,15 +235,7 @@ class AuxArgumentParser(argparse.ArgumentParser):
         if self.fromfile_prefix_chars is not None:
             arg_strings = self._read_args_from_files(arg_strings)
 
-        # map all mutually exclusive arguments to the other arguments
-        # they can't occur with
-        action_conflicts = {}
-        for mutex_group in self._mutually_exclusive_groups:
-            group_actions = mutex_group._group_actions
-            for i, mutex_action in enumerate(mutex_group._group_actions):
-                conflicts = action_conflicts.setdefault(mutex_action, [])
-                conflicts.extend(group_actions[:i])
-                conflicts.extend(group_actions[i + 1 :])
+        action_conflicts, positionals = self._action_tables()
 
         # find all option indices, and determine the arg_string_pattern
         # which has an 'O' if there is an option at an index,
@@ -213,7 +371,7 @@ class AuxArgumentParser(argparse.ArgumentParser):
 
         # the list of Positionals left to be parsed; this is modified
         # by consume_positionals()
-        positionals = self._get_positional_actions()
+        positionals = list(positionals)
 
         # function to convert arg_strings into positional actions
         def consume_positionals(start_index):
@@ -497,8 +655,13 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
                 in the namespace or not.
         """
         self._grid_args = []
+        self._zip_groups = []
         self._retain_config_filename = retain_config_filename
         super().__init__(*args, **kwargs)
+
+        # allows types to be given by name, e.g., in `add_arguments`
+        for type in (int, float, str, bool, strbool):
+            self.register("type", type.__name__, type)
         self.add_argument(
             "--gridparse-config",
             "--gridparse_config",
@@ -509,66 +672,473 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
         )
 
     def parse_args(self, *args, **kwargs):
-        vals = super().parse_args(*args, **kwargs)
+        return list(self.parse_grid(*args, **kwargs))
+
+    def parse_grid(self, args=None, namespace=None) -> Grid:
+        """Parses the command line like `parse_args`, but returns a lazy
+        `Grid` of the namespaces instead of a list. The length of the grid
+        and any namespace in it are computed without expanding the grid."""
+        blocks, argv = self._parse_known_with(
+            self._parse_known_blocks, args, namespace
+        )
+        if argv:
+            msg = argparse._("unrecognized arguments: %s")
+            self.error(msg % " ".join(argv))
 
-        # hacky way to return namespaces in subparser
-        if "___namespaces___" in vals[0]:
-            vals = [ns for subps_ns in vals for ns in subps_ns.___namespaces___]
+        configs = {}
+        blocks = self._config_blocks(blocks, configs)
+        grid = Grid(blocks, partial(self._finalize_namespace, configs=configs))
 
         # get unrecognized arguments from other namespaces
-        if hasattr(vals[0], argparse._UNRECOGNIZED_ARGS_ATTR):
-            argv = getattr(vals[0], argparse._UNRECOGNIZED_ARGS_ATTR)
+        if grid.blocks and hasattr(
+            grid.blocks[0].base, argparse._UNRECOGNIZED_ARGS_ATTR
+        ):
+            argv = getattr(
+                grid.blocks[0].base, argparse._UNRECOGNIZED_ARGS_ATTR
+            )
             msg = argparse._("unrecognized arguments: %s")
             self.error(msg % " ".join(argv))
 
-        for ns in vals:
-            # get defaults from other arguments
-            for arg in dir(ns):
-                val = getattr(ns, arg)
-                if isinstance(val, str) and val.startswith("args."):
-                    borrow_arg = val.split("args.")[1]
-                    setattr(ns, arg, getattr(ns, borrow_arg, None))
-
-        # is_grid_search = len(self._grid_args) > 0
-        # for potential_subparser in getattr(
-        #     self._subparsers, "_group_actions", []
-        # ):
-        #     try:
-        #         grid_args = next(
-        #             iter(potential_subparser.choices.values())
-        #         )._grid_args
-        #         is_grid_search = is_grid_search or grid_args
-        #     except AttributeError:
-        #         continue
-        # if len(vals) == 1 and not is_grid_search:
-        #     warnings.warn("Use")
-        #     return vals[0]
-
-        for ns in vals:
-            cfg = {}
-            if ns.gridparse_config is not None:
-                # reverse for priority to originally first configs
-                for potential_fn in reversed(
-                    getattr(ns, "gridparse_config", [])
+        return grid
+
+    def diff_grid(
+        self,
+        old_args: Union[str, os.PathLike, Sequence[str]],
+        new_args: Optional[Sequence[str]] = None,
+    ) -> GridDiff:
+        """Compares the grids of two command lines of this parser,
+        e.g. to only run the configurations added by new values.
+
+        Args:
+            old_args: the previous arguments, or the path of a manifest
+                saved with `gridparse.diff.save_manifest`.
+            new_args: the current arguments, defaults to `sys.argv[1:]`.
+        """
+        if isinstance(old_args, (str, os.PathLike)):
+            old_args = load_manifest(old_args)
+        return GridDiff(self.parse_grid(old_args), self.parse_grid(new_args))
+
+    async def aiter_grid(
+        self, args=None, namespace=None
+    ) -> AsyncIterator[argparse.Namespace]:
+        """Asynchronously iterates over the namespaces of `parse_grid`.
+        Parsing runs in the default executor of the event loop,
+        and control is yielded back to it after every namespace."""
+        loop = asyncio.get_running_loop()
+        grid = await loop.run_in_executor(
+            None, self.parse_grid, args, namespace
+        )
+        for namespace in grid:
+            yield namespace
+            await asyncio.sleep(0)
+
+    def compile(self) -> CompiledGridParser:
+        """Returns an immutable copy of the parser that can parse from
+        many threads concurrently and raises `GridParseError` instead
+        of exiting, see `CompiledGridParser`."""
+        return CompiledGridParser(self)
+
+    def _config_blocks(
+        self, blocks: List[GridBlock], configs: dict
+    ) -> List[GridBlock]:
+        """Expands the values of searchable arguments and the `_subspaces_`
+        declared in the configuration files of each block into new blocks.
+        Values come from the files already typed and are used as they are.
+        Arguments specified in the command line are not overridden.
+
+        Args:
+            blocks: the blocks of the command line.
+            configs: cache of loaded configuration files.
+        """
+        actions = {action.dest: action for action in self._actions}
+        new_blocks = []
+        for block in blocks:
+            filenames = getattr(block.base, "gridparse_config", None)
+            if not filenames or hasattr(block.base, "___namespaces___"):
+                new_blocks.append(block)
+                continue
+
+            cfg = self._load_configs(filenames, configs)
+            if not isinstance(cfg, dict):
+                cfg = OmegaConf.to_container(cfg, resolve=True)
+
+            grid_values = {
+                arg: self._config_values(actions[arg], value)
+                for arg, value in cfg.items()
+                if arg in self._grid_args
+            }
+            for overrides in self._config_subspaces(cfg.get("_subspaces_")):
+                namespace = deepcopy(block.base)
+                specified = namespace.___specified_args___
+                values = dict(grid_values)
+                for arg, value in overrides.items():
+                    if arg in self._grid_args:
+                        values[arg] = self._config_values(actions[arg], value)
+                    elif arg not in specified and hasattr(namespace, arg):
+                        setattr(namespace, arg, value)
+                        # so that `_finalize_namespace` doesn't override it
+                        specified.add(arg)
+
+                for arg, value in values.items():
+                    if arg not in specified and hasattr(namespace, arg):
+                        setattr(namespace, arg, value)
+                        specified.add(arg)
+
+                new_blocks.append(self._make_block(namespace))
+
+        return new_blocks
+
+    @staticmethod
+    def _config_values(action: argparse.Action, value: Any) -> List[Any]:
+        """Returns the values of a searchable argument from
+        a configuration file, where lists are multiple values
+        (lists of lists for arguments whose values are lists)."""
+        if getattr(action.type, "delimiter", None) is not None:
+            if isinstance(value, list) and all(
+                isinstance(v, list) for v in value
+            ):
+                return value
+            return [value]
+        return value if isinstance(value, list) else [value]
+
+    def _config_subspaces(self, subspaces: Optional[List[dict]]) -> List[dict]:
+        """Returns the values of every path through
+        the (nested) `_subspaces_` of a configuration file."""
+        if not subspaces:
+            return [{}]
+        if not isinstance(subspaces, list) or not all(
+            isinstance(subspace, dict) for subspace in subspaces
+        ):
+            self.error(
+                "`_subspaces_` in configuration files must be a list of mappings"
+            )
+
+        paths = []
+        for subspace in subspaces:
+            values = {k: v for k, v in subspace.items() if k != "_subspaces_"}
+            for path in self._config_subspaces(subspace.get("_subspaces_")):
+                paths.append(dict(values, **path))
+        return paths
+
+    def _finalize_namespace(
+        self, ns: argparse.Namespace, configs: Optional[dict] = None
+    ) -> argparse.Namespace:
+        """Resolves `args.X` values, populates the namespace
+        from the configuration files and removes internal attributes.
+
+        Args:
+            ns: namespace to finalize in-place.
+            configs: cache of loaded configuration files.
+        """
+        # get defaults from other arguments
+        for arg in sorted(vars(ns)):
+            val = getattr(ns, arg)
+            if isinstance(val, str) and val.startswith("args."):
+                borrow_arg = val.split("args.")[1]
+                setattr(ns, arg, getattr(ns, borrow_arg, None))
+
+        if ns.gridparse_config is not None:
+            cfg = self._load_configs(ns.gridparse_config, configs)
+            for arg in cfg:
+                if not hasattr(ns, arg):
+                    continue
+                if arg not in ns.___specified_args___:
+                    setattr(ns, arg, cfg.get(arg))
+
+        if not self._retain_config_filename:
+            delattr(ns, "gridparse_config")
+
+        delattr(ns, "___specified_args___")
+
+        return ns
+
+    @staticmethod
+    def _load_configs(filenames: List[str], configs: Optional[dict] = None):
+        """Merges the configuration files in `filenames`, giving priority
+        to the ones that appear first. Caches the result in `configs`."""
+        key = tuple(filenames)
+        if configs is not None and key in configs:
+            return configs[key]
+
+        cfg = {}
+        # reverse for priority to originally first configs
+        for potential_fn in reversed(filenames):
+            if os.path.isfile(potential_fn):
+                cfg = OmegaConf.merge(cfg, OmegaConf.load(potential_fn))
+
+        if configs is not None:
+            configs[key] = cfg
+        return cfg
+
+    def to_argv(self, namespace: argparse.Namespace) -> List[str]:
+        """Returns the command-line arguments that reproduce a single
+        configuration returned by `parse_args`, i.e.
+        `parse_args(to_argv(ns)) == [ns]`. Only values that differ
+        from their default are included.
+
+        Raises:
+            ValueError: if some value cannot be represented
+                in the command line.
+        """
+        return self._to_argv(namespace, self._argv_fields())
+
+    def to_argv_many(
+        self, namespaces: Iterable[argparse.Namespace]
+    ) -> List[List[str]]:
+        """Batch version of `to_argv`, which reuses
+        the formatting of each argument."""
+        fields = self._argv_fields()
+        return [self._to_argv(ns, fields) for ns in namespaces]
+
+    def _to_argv(
+        self,
+        namespace: argparse.Namespace,
+        fields: Tuple[List[Callable], Optional[argparse.Action]],
+    ) -> List[str]:
+        fields, subparsers_action = fields
+
+        argv = []
+        for field in fields:
+            argv.extend(field(namespace))
+
+        if subparsers_action is not None:
+            if subparsers_action.dest is argparse.SUPPRESS:
+                raise ValueError(
+                    "Cannot determine the subparser without `dest`."
+                )
+            parser_name = getattr(namespace, subparsers_action.dest, None)
+            if parser_name is not None:
+                parser = subparsers_action.choices[parser_name]
+                argv.append(parser_name)
+                argv.extend(parser.to_argv(namespace))
+
+        return argv
+
+    def _argv_fields(self) -> Tuple[List[Callable], Optional[argparse.Action]]:
+        """Returns the functions that format each argument of a namespace
+        (positionals first) and the subparsers action, if any. Cached
+        until new arguments are added."""
+        cache = getattr(self, "_argv_cache", None)
+        if cache is not None and cache[0] == len(self._actions):
+            return cache[1]
+
+        positionals, optionals = [], []
+        subparsers_action = None
+        for action in self._actions:
+            if isinstance(action, argparse._SubParsersAction):
+                subparsers_action = action
+            elif (
+                action.dest is argparse.SUPPRESS
+                or action.dest == "gridparse_config"
+                or isinstance(
+                    action, (argparse._HelpAction, argparse._VersionAction)
+                )
+            ):
+                continue
+            elif action.option_strings:
+                optionals.append(self._argv_field(action))
+            else:
+                positionals.append(self._argv_field(action))
+
+        fields = (positionals + optionals, subparsers_action)
+        self._argv_cache = (len(self._actions), fields)
+        return fields
+
+    def _argv_field(
+        self, action: argparse.Action
+    ) -> Callable[[argparse.Namespace], List[str]]:
+        """Creates the function that formats the value
+        of `action` in a namespace as command-line arguments."""
+
+        dest = action.dest
+        searchable = dest in self._grid_args
+        type_func = self._registry_get("type", action.type, action.type)
+
+        option_string = None
+        if action.option_strings:
+            long_option_strings = [
+                o for o in action.option_strings if o[1:2] in self.prefix_chars
+            ]
+            option_string = (long_option_strings or action.option_strings)[0]
+
+        default = action.default
+        borrow_arg = None
+        convert_default = False
+        if isinstance(default, str) and default.startswith("args."):
+            borrow_arg = default.split("args.")[1]
+        elif isinstance(default, str) and isinstance(
+            action, argparse._StoreAction
+        ):
+            convert_default = True
+        # the converted default, once it is needed
+        converted = []
+
+        def default_value():
+            if not convert_default:
+                return default
+            if not converted:
+                # like argparse, the default is only converted if needed,
+                # and if it cannot be converted, no value is the default
+                try:
+                    converted.append(self._get_value(action, default))
+                except (argparse.ArgumentError, TypeError, ValueError):
+                    converted.append(_NO_DEFAULT)
+            return converted[0]
+
+        def is_default(namespace, value):
+            if action.required:
+                return False
+            if borrow_arg is not None:
+                other = getattr(namespace, borrow_arg, None)
+                return _same_value(value, other)
+            if convert_default and isinstance(type_func, argparse.FileType):
+                # don't open files to compare them
+                return getattr(value, "name", None) == default
+            return _same_value(value, default_value())
+
+        def fmt(value, top_level=True):
+            grid_value = searchable and top_level
+            token = self._format_value(type_func, value, grid_value)
+            if (
+                grid_value
+                and value is not None
+                and type_func is not strbool
+                and token == "_None_"
+            ):
+                # would be parsed back as `None`
+                raise ValueError(
+                    f"Cannot represent {token!r} in the command line."
+                )
+            return self._check_token(token)
+
+        def option(tokens):
+            if option_string is not None and len(tokens) == 1:
+                if tokens[0][:1] in self.prefix_chars:
+                    return [f"{option_string}={tokens[0]}"]
+                return [option_string, tokens[0]]
+            for token in tokens:
+                if (
+                    token[:1] in self.prefix_chars
+                    and self._parse_optional(token) is not None
                 ):
-                    if os.path.isfile(potential_fn):
-                        cfg = OmegaConf.merge(cfg, OmegaConf.load(potential_fn))
+                    raise ValueError(f"Cannot represent {dest}={token!r}.")
+            if option_string is None:
+                return tokens
+            return [option_string] + tokens
+
+        if isinstance(action, getattr(argparse, "BooleanOptionalAction", ())):
+            negative = [
+                o for o in action.option_strings if o.startswith("--no-")
+            ]
+
+            def field(namespace):
+                value = getattr(namespace, dest)
+                if is_default(namespace, value):
+                    return []
+                return [option_string] if value else negative[:1]
+
+        elif isinstance(
+            action, (argparse._StoreConstAction, argparse._AppendConstAction)
+        ):
 
-                for arg in cfg:
-                    if not hasattr(ns, arg):
-                        continue
-                    if arg not in ns.___specified_args___:
-                        setattr(ns, arg, cfg.get(arg))
+            def field(namespace):
+                value = getattr(namespace, dest)
+                if is_default(namespace, value):
+                    return []
+                if isinstance(action, argparse._AppendConstAction):
+                    extra = value[len(default or []) :]
+                    if any(v != action.const for v in extra):
+                        raise ValueError(f"Cannot represent {dest}={value!r}.")
+                    return [option_string] * len(extra)
+                if not _same_value(value, action.const):
+                    raise ValueError(f"Cannot represent {dest}={value!r}.")
+                return [option_string]
+
+        elif isinstance(action, argparse._CountAction):
+
+            def field(namespace):
+                value = getattr(namespace, dest)
+                if is_default(namespace, value):
+                    return []
+                return [option_string] * (value - (default or 0))
+
+        elif isinstance(action, argparse._AppendAction):
+
+            def field(namespace):
+                value = getattr(namespace, dest)
+                if is_default(namespace, value):
+                    return []
+                argv = []
+                for item in value[len(default or []) :]:
+                    if action.nargs is None or action.nargs == "?":
+                        argv.extend(option([fmt(item)]))
+                    else:
+                        argv.extend(option([fmt(v) for v in item]))
+                return argv
 
-            if not self._retain_config_filename:
-                delattr(ns, "gridparse_config")
+        else:
+            single = searchable or action.nargs in (None, "?")
+
+            def field(namespace):
+                if not hasattr(namespace, dest):
+                    return []
+                value = getattr(namespace, dest)
+                if is_default(namespace, value):
+                    return []
+                if single:
+                    if action.nargs == "?" and _same_value(value, action.const):
+                        return option([])
+                    return option([fmt(value)])
+                return option([fmt(v) for v in value])
+
+        return field
+
+    def _format_value(
+        self, type_func: Callable, value: Any, searchable: bool
+    ) -> str:
+        """Formats a (converted) value as the string it was converted from."""
+
+        if value is None:
+            if searchable and type_func is not strbool:
+                return "_None_"
+            if hasattr(type_func, "delimiter"):
+                return "None"
+            raise ValueError("Cannot represent `None` in the command line.")
+
+        # lists from `list_as_delim_str`, including searchable `nargs`
+        if hasattr(type_func, "delimiter"):
+            return type_func.delimiter.join(
+                self._format_value(type_func.actual_type, v, False)
+                for v in value
+            )
 
-            delattr(ns, "___specified_args___")
+        if isinstance(type_func, argparse.FileType) and hasattr(value, "name"):
+            return value.name
+        if isinstance(value, bool) and type_func is strbool:
+            return "true" if value else "false"
+        if isinstance(value, float):
+            return repr(value)
+        return str(value)
 
-        return vals
+    def _check_token(self, token: str) -> str:
+        """Makes sure `token` will be parsed back as a value."""
+        if (
+            token.startswith("{")
+            or token.endswith("}")
+            or token.startswith("args.")
+        ):
+            raise ValueError(f"Cannot represent {token!r} in the command line.")
+        return token
 
     def _check_value(self, action, value):
         """Overwrites `_check_value` to support grid search with `None`s."""
+        if isinstance(value, ValueRange):
+            # only check the values if they are constrained
+            if action.choices is not None:
+                for v in value:
+                    self._check_value(action, v)
+            return
+
         # converted value must be one of the choices (if specified)
         if action.choices is not None and (
             value not in action.choices and value is not None
@@ -613,6 +1183,16 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
             msg = argparse._('%r is not callable')
             raise argparse.ArgumentError(action, msg % type_func)
 
+        # if arg_string is a range, e.g. "lin:0:1:11", then return it lazily
+        if action.dest in self._grid_args and accepts_ranges(type_func):
+            try:
+                value_range = parse_range(arg_string, type_func)
+            except argparse.ArgumentTypeError as err:
+                raise argparse.ArgumentError(action, str(err))
+            if value_range is not None:
+                self._check_range(action, value_range)
+                return value_range
+
         # convert the value to the appropriate type
         try:
             result = type_func(arg_string)
@@ -633,6 +1213,22 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
         # return the converted value
         return result
 
+    def _check_range(self, action, value_range: ValueRange):
+        """Converts the endpoints of `value_range` to fail early
+        if its values cannot be converted to the type of `action`."""
+        if not len(value_range):
+            msg = argparse._('empty range: %r')
+            raise argparse.ArgumentError(action, msg % value_range)
+
+        for i in (0, -1):
+            try:
+                value_range[i]
+            except (argparse.ArgumentTypeError, TypeError, ValueError):
+                name = getattr(action.type, '__name__', repr(action.type))
+                args = {'type': name, 'value': value_range}
+                msg = argparse._('invalid %(type)s value: %(value)r')
+                raise argparse.ArgumentError(action, msg % args)
+
     @staticmethod
     def _add_split_in_arg(arg: str, split: str) -> str:
         """Adds the `split` to the name of the argument `arg`."""
@@ -669,29 +1265,58 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
         # create multiple arguments for each split
         splits = kwargs.pop("splits", [])
         if splits:
-            actions = []
-            for split in splits:
+            return [
+                self.add_argument(*cp_args, **cp_kwargs)
+                for cp_args, cp_kwargs in self._split_specs(
+                    args, kwargs, splits
+                )
+            ]
 
-                cp_args = deepcopy(list(args))
-                cp_kwargs = deepcopy(kwargs)
+        if self._grid_kwargs(kwargs):
+            self._grid_args.append(new_kwargs["dest"])
 
-                if args:
-                    i = 0
-                    while cp_args[0][i] in self.prefix_chars:
-                        i += 1
+        # doesn't add `searchable` in _StoreAction
+        return super().add_argument(*args, **kwargs)
 
-                    cp_args[0] = cp_args[0][:i] + self._add_split_in_arg(
-                        cp_args[0][i:], split
-                    )
+    def _split_specs(
+        self, args: Sequence[str], kwargs: dict, splits: Sequence[str]
+    ) -> List[Tuple[List[str], dict]]:
+        """Returns the arguments and keyword arguments
+        of the argument of each split."""
+        specs = []
+        for split in splits:
+
+            cp_args = list(args)
+            cp_kwargs = dict(kwargs)
+            if "default" in cp_kwargs:
+                cp_kwargs["default"] = deepcopy(cp_kwargs["default"])
+
+            if args:
+                i = 0
+                while cp_args[0][i] in self.prefix_chars:
+                    i += 1
+
+                cp_args[0] = cp_args[0][:i] + self._add_split_in_arg(
+                    cp_args[0][i:], split
+                )
 
-                else:
-                    cp_kwargs["dest"] = self._add_split_in_arg(
-                        cp_kwargs["dest"], split
-                    )
+            else:
+                cp_kwargs["dest"] = self._add_split_in_arg(
+                    cp_kwargs["dest"], split
+                )
+
+            specs.append((cp_args, cp_kwargs))
 
-                actions.append(self.add_argument(*cp_args, **cp_kwargs))
+        return specs
 
-            return actions
+    def _grid_kwargs(self, kwargs: dict) -> bool:
+        """Modifies the keyword arguments of `add_argument` in-place
+        to support grid search, and returns whether the argument
+        is searchable."""
+
+        type = kwargs.get("type", None)
+        if isinstance(type, str):
+            kwargs["type"] = self._registry_get("type", type, type)
 
         type = kwargs.get("type", None)
         if type is not None and type == bool:
@@ -703,9 +1328,6 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
 
         searchable = kwargs.pop("searchable", False)
         if searchable:
-            dest = new_kwargs["dest"]
-            self._grid_args.append(dest)
-
             nargs = kwargs.get("nargs", None)
             type = kwargs.get("type", None)
 
@@ -717,8 +1339,201 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
             kwargs["nargs"] = nargs
             kwargs["type"] = type
 
-        # doesn't add `searchable` in _StoreAction
-        return super().add_argument(*args, **kwargs)
+        return searchable
+
+    def add_arguments(
+        self, specs: Union[str, os.PathLike, Sequence, dict]
+    ) -> List[argparse.Action]:
+        """Adds many arguments at once, which is considerably faster
+        than calling `add_argument` for each of them in large parsers.
+        The arguments of all splits are created in a single pass,
+        and conflicts between option strings are checked once.
+
+        Example:
+            ```
+            parser.add_arguments(
+                {
+                    "--lr": dict(type=float, searchable=True),
+                    "--batch-size": dict(type=int, splits=["train", "test"]),
+                    ("-v", "--verbose"): dict(action="store_true"),
+                }
+            )
+            ```
+
+        Args:
+            specs: the arguments, as a mapping from the name(s) of each
+                argument to its keyword arguments for `add_argument`,
+                or as a sequence of keyword arguments, where the name(s)
+                are under `args`. Can also be a path to a configuration
+                file (loaded with `omegaconf`) with either structure,
+                in which case types are given by name (e.g., `"float"`).
+
+        Returns:
+            The created actions, with each split
+            being a separate action.
+        """
+
+        if isinstance(specs, (str, os.PathLike)):
+            specs = OmegaConf.to_container(OmegaConf.load(specs))
+
+        if isinstance(specs, dict):
+            specs = [
+                dict(
+                    kwargs or {},
+                    args=[name] if isinstance(name, str) else list(name),
+                )
+                for name, kwargs in specs.items()
+            ]
+
+        all_specs = []
+        for spec in specs:
+            kwargs = dict(spec)
+            args = kwargs.pop("args", [])
+            if isinstance(args, str):
+                args = [args]
+
+            splits = kwargs.pop("splits", [])
+            if splits:
+                all_specs.extend(self._split_specs(args, kwargs, splits))
+            else:
+                all_specs.append((list(args), kwargs))
+
+        created = [self._create_action(*spec) for spec in all_specs]
+        actions = [action for action, _ in created]
+
+        # check for conflicts once for all new option strings
+        option_string_actions = {}
+        conflicts = []
+        for action in actions:
+            for option_string in action.option_strings:
+                conflict_action = self._option_string_actions.get(
+                    option_string, option_string_actions.get(option_string)
+                )
+                if conflict_action is not None:
+                    conflicts.append((action, option_string, conflict_action))
+                option_string_actions[option_string] = action
+
+        if conflicts and self.conflict_handler == "error":
+            action, option_string, conflict_action = conflicts[0]
+            self._handle_conflict_error(
+                action, [(option_string, conflict_action)]
+            )
+
+        for action, searchable in created:
+            if searchable:
+                self._grid_args.append(action.dest)
+
+            if conflicts:
+                # let argparse resolve them
+                self._add_action(action)
+            else:
+                self._register_action(action)
+
+        return actions
+
+    def _create_action(
+        self, args: List[str], kwargs: dict
+    ) -> Tuple[argparse.Action, bool]:
+        """Creates the action of `add_argument` without adding it,
+        and returns it along with whether it is searchable."""
+
+        kwargs = dict(kwargs)
+        searchable = self._grid_kwargs(kwargs)
+
+        chars = self.prefix_chars
+        if not args or (len(args) == 1 and args[0][0] not in chars):
+            if args and "dest" in kwargs:
+                raise ValueError("dest supplied twice for positional argument")
+            kwargs = self._get_positional_kwargs(*args, **kwargs)
+        else:
+            kwargs = self._get_optional_kwargs(*args, **kwargs)
+
+        # if no default was supplied, use the parser-level default
+        if "default" not in kwargs:
+            dest = kwargs["dest"]
+            if dest in self._defaults:
+                kwargs["default"] = self._defaults[dest]
+            elif self.argument_default is not None:
+                kwargs["default"] = self.argument_default
+
+        action_class = self._pop_action_class(kwargs)
+        if not callable(action_class):
+            raise ValueError('unknown action "%s"' % (action_class,))
+        action = action_class(**kwargs)
+
+        type_func = self._registry_get("type", action.type, action.type)
+        if not callable(type_func):
+            raise ValueError("%r is not callable" % (type_func,))
+
+        if type_func is argparse.FileType:
+            raise ValueError(
+                "%r is a FileType class object, instance of it"
+                " must be passed" % (type_func,)
+            )
+
+        if isinstance(action.metavar, tuple):
+            try:
+                self._get_formatter()._format_args(action, None)
+            except TypeError:
+                raise ValueError("length of metavar tuple does not match nargs")
+
+        return action, searchable
+
+    def _register_action(self, action: argparse.Action) -> argparse.Action:
+        """Adds an action whose option strings are known not to conflict."""
+        group = self._optionals if action.option_strings else self._positionals
+
+        self._actions.append(action)
+        action.container = group
+        group._group_actions.append(action)
+
+        for option_string in action.option_strings:
+            self._option_string_actions[option_string] = action
+            if self._negative_number_matcher.match(option_string):
+                if not self._has_negative_number_optionals:
+                    self._has_negative_number_optionals.append(True)
+
+        return action
+
+    def add_zip_group(self, *args: str) -> Tuple[str, ...]:
+        """Makes searchable arguments vary together instead of as a
+        product: their values are paired by position and treated as
+        a single axis of the grid, e.g. `--lr 0.1 0.01 --warmup 100 1000`
+        results in 2 configurations instead of 4. Arguments given
+        a single value are paired with every value of the others.
+
+        Example:
+            ```
+            parser.add_argument("--lr", type=float, searchable=True)
+            parser.add_argument("--warmup", type=int, searchable=True)
+            parser.add_zip_group("--lr", "--warmup")
+            ```
+
+        Args:
+            args: the option strings or `dest`s of the arguments.
+
+        Returns:
+            The `dest`s of the arguments.
+
+        Raises:
+            ValueError: if an argument is not searchable
+                or already in a zip group.
+        """
+        dests = []
+        for arg in args:
+            action = self._option_string_actions.get(arg)
+            dest = action.dest if action is not None else arg
+            if dest not in self._grid_args:
+                raise ValueError(f"{arg} is not a searchable argument.")
+            if dest in dests or any(dest in g for g in self._zip_groups):
+                raise ValueError(f"{arg} is already in a zip group.")
+            dests.append(dest)
+
+        if len(dests) < 2:
+            raise ValueError("A zip group needs at least two arguments.")
+
+        self._zip_groups.append(tuple(dests))
+        return tuple(dests)
 
     class Subspace:
         def __init__(self, parent: Optional["Subspace"] = None):
@@ -780,6 +1595,14 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
         Returns:
             A list of namespaces instead os a single namespace.
         """
+        blocks, args = self._parse_known_blocks(arg_strings, namespace)
+        return [ns for block in blocks for ns in block], args
+
+    def _parse_known_blocks(
+        self, arg_strings: List[str], namespace: argparse.Namespace
+    ) -> Tuple[List[GridBlock], List[str]]:
+        """Parses each `{}` subspace path once, and returns
+        the unexpanded grid of each one."""
 
         # if { and } denote a subspace and not inside a string of something else
         new_arg_strings = []
@@ -832,46 +1655,67 @@ class GridArgumentParser(_GridActionsContainer, AuxArgumentParser):
             current_subspace = current_subspace.add_arg(arg)
 
         all_arg_strings = root_subspace.parse_paths()
-        all_namespaces = []
+        all_blocks = []
         all_args = []
 
         if not all_arg_strings:
             namespace, args = super()._parse_known_args(
                 arg_strings, deepcopy(namespace)
             )
-            return [namespace], args
+            return [GridBlock(namespace, [])], args
 
         # for all possible combinations in the grid search subspaces
         for arg_strings in all_arg_strings:
             new_namespace, args = super()._parse_known_args(
                 arg_strings, deepcopy(namespace)
             )
-
-            namespaces = [deepcopy(new_namespace)]
-
-            for arg in self._grid_args:
-                if not hasattr(new_namespace, arg):
-                    continue
-                values = getattr(new_namespace, arg)
-                for ns in namespaces:
-                    ns.__delattr__(arg)
-                if not isinstance(values, list):
-                    values = [values]
-
-                # duplicate the existing namespaces
-                # for all different values of the grid search param
-
-                new_namespaces = []
-
-                for value in values:
-                    for ns in namespaces:
-                        new_ns = deepcopy(ns)
-                        setattr(new_ns, arg, value)
-                        new_namespaces.append(new_ns)
-
-                namespaces = new_namespaces
-
-            all_namespaces.extend(namespaces)
+            all_blocks.append(self._make_block(new_namespace))
             all_args.extend(args)
 
-        return all_namespaces, all_args
+        return all_blocks, all_args
+
+    def _make_block(self, namespace: argparse.Namespace) -> GridBlock:
+        """Creates the grid of `namespace`, whose searchable
+        arguments hold all their values."""
+        zip_groups = {
+            dest: group for group in self._zip_groups for dest in group
+        }
+
+        axes = []
+        # position in `axes` and members of each zip group
+        zipped = {}
+        for arg in self._grid_args:
+            if not hasattr(namespace, arg):
+                continue
+            values = getattr(namespace, arg)
+            if isinstance(values, ValueRange):
+                values = ValueChain([values])
+            elif not isinstance(values, list):
+                values = [values]
+            elif any(isinstance(v, ValueRange) for v in values):
+                values = ValueChain(values)
+
+            group = zip_groups.get(arg)
+            if group is None:
+                axes.append((arg, values))
+                continue
+            # the group is an axis at the position of its first argument
+            if group not in zipped:
+                zipped[group] = (len(axes), [])
+                axes.append(None)
+            zipped[group][1].append((arg, values))
+
+        for position, members in zipped.values():
+            if len(members) == 1:
+                axes[position] = members[0]
+                continue
+            try:
+                values = ZippedValues([values for _, values in members])
+            except ValueError:
+                self.error(
+                    "zipped arguments have different numbers of values: "
+                    + ", ".join(f"{arg} ({len(v)})" for arg, v in members)
+                )
+            axes[position] = (tuple(arg for arg, _ in members), values)
+
+        return GridBlock(namespace, axes)
@@ -0,0 +1,375 @@
+import argparse
+from itertools import product
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from gridparse.grid import Grid, GridBlock, ZippedValues
+from gridparse.ranges import ValueChain, ValueRange
+from gridparse.utils import _freeze
+
+
+def _condition_keys(condition: Any) -> set:
+    """Sets (or frozensets) match any of their values,
+    and anything else is matched by equality."""
+    if isinstance(condition, (set, frozenset)):
+        return set(_freeze(v) for v in condition)
+    return {_freeze(condition)}
+
+
+def _matcher(condition: Any) -> Callable[[Any], bool]:
+    allowed = _condition_keys(condition)
+    return lambda value: _freeze(value) in allowed
+
+
+def _borrows(values: Sequence) -> bool:
+    """Whether some value of an axis is `args.X`, which makes the
+    namespaces vary with the axis of `X` too."""
+    if isinstance(values, ZippedValues):
+        return any(_borrows(v) for v in values.values)
+    if isinstance(values, ValueChain):
+        values = [
+            v
+            for part in values.parts
+            if not isinstance(part, ValueRange)
+            for v in part
+        ]
+    return any(isinstance(v, str) and v.startswith("args.") for v in values)
+
+
+def _bits(bitmap: int) -> List[int]:
+    """Positions of the set bits of `bitmap`, in increasing order."""
+    return [i for i, bit in enumerate(reversed(bin(bitmap)[2:])) if bit == "1"]
+
+
+class _BlockColumns:
+    """Values of the namespaces of a block of a grid, either constant
+    across the block or varying along one of its axes.
+
+    Values that vary along more than one axis (e.g., `args.X` among the
+    values of a searchable argument) can't be described this way, so the
+    namespaces of such blocks are indexed with bitmaps in `fallback`.
+
+    Args:
+        grid: the grid.
+        b: the index of the block in the grid.
+    """
+
+    def __init__(self, grid: Grid, b: int):
+        self.block: GridBlock = grid.blocks[b]
+        self.offset: int = grid.offsets[b]
+        self.fallback: Optional[GridIndex] = None
+
+        if any(_borrows(values) for _, values in self.block.axes):
+            self._fall_back(grid)
+            return
+
+        # namespaces are finalized (configuration files, `args.X`, etc.),
+        # so use them instead of the values of the axes, where each value
+        # can only vary along a single axis
+        reference = vars(grid[self.offset])
+        self.constants: Dict[str, Any] = dict(reference)
+        self.along: Dict[str, Tuple[int, List[Any]]] = {}
+        for k, size in enumerate(self.block.sizes):
+            if size == 1:
+                continue
+            positions = [0] * len(self.block.sizes)
+            columns = {attr: [value] for attr, value in reference.items()}
+            for j in range(1, size):
+                positions[k] = j
+                namespace = grid[self.offset + self.block.index(positions)]
+                for attr, value in vars(namespace).items():
+                    columns[attr].append(value)
+
+            for attr, values in columns.items():
+                first = _freeze(values[0])
+                if any(_freeze(v) != first for v in values[1:]):
+                    if attr in self.along:
+                        self._fall_back(grid)
+                        return
+                    self.along[attr] = (k, values)
+                    self.constants.pop(attr, None)
+
+        if not self._consistent(grid):
+            self._fall_back(grid)
+
+    def _fall_back(self, grid: Grid):
+        self.constants = {}
+        self.along = {}
+        self.fallback = GridIndex(
+            [grid[self.offset + j] for j in range(len(self.block))]
+        )
+
+    def _value(self, attr: str, positions: Sequence[int]) -> Any:
+        if attr in self.constants:
+            return self.constants[attr]
+        k, values = self.along[attr]
+        return values[positions[k]]
+
+    def _consistent(self, grid: Grid) -> bool:
+        """Checks that the values only vary along their axis by also
+        moving along each axis with the others at their last position."""
+        sizes = self.block.sizes
+        if sum(size > 1 for size in sizes) < 2:
+            return True
+        attrs = set(self.constants) | set(self.along)
+        for k, size in enumerate(sizes):
+            positions = [s - 1 for s in sizes]
+            for j in range(size if size > 1 else 0):
+                positions[k] = j
+                namespace = grid[self.offset + self.block.index(positions)]
+                if set(vars(namespace)) != attrs:
+                    return False
+                for attr, value in vars(namespace).items():
+                    expected = self._value(attr, positions)
+                    if _freeze(value) != _freeze(expected):
+                        return False
+        return True
+
+    def positions(
+        self, conditions: Dict[str, Callable[[Any], bool]]
+    ) -> Optional[List[Sequence[int]]]:
+        """Returns the positions in each axis that match the conditions,
+        or `None` if no configuration of the block matches."""
+        allowed = [range(size) for size in self.block.sizes]
+        for attr, match in conditions.items():
+            if attr in self.constants:
+                if not match(self.constants[attr]):
+                    return None
+            elif attr in self.along:
+                k, values = self.along[attr]
+                allowed[k] = [j for j in allowed[k] if match(values[j])]
+                if not allowed[k]:
+                    return None
+            else:
+                return None
+        return allowed
+
+    def indices(self, allowed: List[Sequence[int]]) -> Iterator[int]:
+        """Yields the grid indices of the positions
+        in `allowed`, in increasing order."""
+        # the first axis varies the fastest
+        for positions in product(*reversed(allowed)):
+            yield self.offset + self.block.index(positions[::-1])
+
+
+class GridIndex:
+    """Index of the configurations of a grid, to find the ones
+    with some values without scanning all of them.
+
+    Built from a `Grid` (see `GridArgumentParser.parse_grid`), queries
+    use index arithmetic over the values of each searchable argument in
+    every `{}` subspace path, so their cost depends on the number of
+    values and of matches, not on the size of the grid. Built from a list
+    of namespaces (e.g., from `parse_args`), queries use inverted bitmaps
+    of the configurations with each value of each argument.
+
+    Conditions are given as keyword arguments, where sets (or frozensets)
+    match any of their values, and anything else is matched by equality
+    (of value and type, e.g., `1` does not match `True`). Configurations
+    without some argument of the conditions never match.
+
+    Example:
+        ```
+        index = GridIndex(parser.parse_grid(argv))
+        index.where(dataset="cifar", lr={0.1, 0.01})  # indices
+        index.select(dataset="cifar")  # namespaces
+        index.group_by("dataset")  # {"cifar": [...], "mnist": [...]}
+        ```
+
+    Args:
+        configs: a `Grid` or a list of namespaces.
+    """
+
+    def __init__(self, configs: Sequence[argparse.Namespace]):
+        self.configs = configs
+
+        self._blocks: Optional[List[_BlockColumns]] = None
+        self._lists: Optional[Dict[str, Dict[Hashable, List[int]]]] = None
+        self._values: Dict[Tuple[str, Hashable], Any] = {}
+        self._bitmaps: Dict[Tuple[str, Hashable], int] = {}
+
+        if isinstance(configs, Grid):
+            self._blocks = [
+                _BlockColumns(configs, b)
+                for b, block in enumerate(configs.blocks)
+                if len(block)
+            ]
+        else:
+            # inverted lists, turned into bitmaps the first time they're used
+            self._lists = {}
+            for i, namespace in enumerate(configs):
+                for attr, value in vars(namespace).items():
+                    key = _freeze(value)
+                    lists = self._lists.setdefault(attr, {})
+                    lists.setdefault(key, []).append(i)
+                    self._values.setdefault((attr, key), value)
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def _bitmap(self, attr: str, key: Hashable) -> int:
+        bitmap = self._bitmaps.get((attr, key))
+        if bitmap is None:
+            bits = bytearray((len(self.configs) + 7) // 8)
+            for i in self._lists[attr][key]:
+                bits[i >> 3] |= 1 << (i & 7)
+            bitmap = int.from_bytes(bits, "little")
+            self._bitmaps[(attr, key)] = bitmap
+        return bitmap
+
+    def _where_bitmap(self, conditions: Dict[str, Any]) -> int:
+        result = (1 << len(self.configs)) - 1
+        for attr, condition in conditions.items():
+            lists = self._lists.get(attr, {})
+            matched = 0
+            for key in _condition_keys(condition):
+                if key in lists:
+                    matched |= self._bitmap(attr, key)
+            result &= matched
+            if not result:
+                break
+        return result
+
+    def where(self, **conditions: Any) -> List[int]:
+        """Returns the indices of the configurations
+        that match the conditions, in increasing order."""
+        if self._blocks is None:
+            return _bits(self._where_bitmap(conditions))
+
+        matchers = {attr: _matcher(c) for attr, c in conditions.items()}
+        indices = []
+        for columns in self._blocks:
+            if columns.fallback is not None:
+                indices.extend(
+                    columns.offset + j
+                    for j in columns.fallback.where(**conditions)
+                )
+                continue
+            allowed = columns.positions(matchers)
+            if allowed is not None:
+                indices.extend(columns.indices(allowed))
+        return indices
+
+    def count(self, **conditions: Any) -> int:
+        """Returns the number of configurations that match
+        the conditions, without enumerating them."""
+        if self._blocks is None:
+            return bin(self._where_bitmap(conditions)).count("1")
+
+        matchers = {attr: _matcher(c) for attr, c in conditions.items()}
+        count = 0
+        for columns in self._blocks:
+            if columns.fallback is not None:
+                count += columns.fallback.count(**conditions)
+                continue
+            allowed = columns.positions(matchers)
+            if allowed is not None:
+                size = 1
+                for positions in allowed:
+                    size *= len(positions)
+                count += size
+        return count
+
+    def select(self, **conditions: Any) -> Iterator[argparse.Namespace]:
+        """Yields the configurations that match the conditions,
+        which are only created as needed for a `Grid`."""
+        for i in self.where(**conditions):
+            yield self.configs[i]
+
+    def group_by(self, *attrs: str) -> Dict[Hashable, List[int]]:
+        """Returns the indices of the configurations with each combination
+        of values of `attrs` (tuples of values for multiple `attrs`, where
+        lists are also turned into tuples). Configurations without
+        some of the arguments are left out.
+
+        Note that values that are equal in Python, like 1, 1.0 and `True`,
+        are the same key of the result, so their groups are merged (unlike
+        `where`, which tells them apart)."""
+        result: Dict[Hashable, List[int]] = {}
+        for value, indices in self._groups(attrs).values():
+            result.setdefault(value, []).extend(indices)
+        return {value: sorted(indices) for value, indices in result.items()}
+
+    def _groups(
+        self, attrs: Sequence[str]
+    ) -> Dict[Hashable, Tuple[Hashable, List[int]]]:
+        """The groups of `group_by`, by the values of `attrs` as `_freeze`
+        keys (which tell apart values of different types), with the value
+        of each key and its indices in no particular order."""
+        groups: Dict[Hashable, Tuple[Hashable, List[int]]] = {}
+
+        def add(values: List[Any], indices: Iterator[int]):
+            key = tuple(_freeze(v) for v in values)
+            if key not in groups:
+                value = _freeze(values[0] if len(attrs) == 1 else values, False)
+                groups[key] = (value, [])
+            groups[key][1].extend(indices)
+
+        if self._blocks is None:
+            # only the combinations of values that appear together
+            combinations = [((1 << len(self.configs)) - 1, [])]
+            for attr in attrs:
+                new_combinations = []
+                for bitmap, keys in combinations:
+                    for key in self._lists.get(attr, {}):
+                        matched = bitmap & self._bitmap(attr, key)
+                        if matched:
+                            new_combinations.append((matched, keys + [key]))
+                combinations = new_combinations
+            for bitmap, keys in combinations:
+                values = [self._values[(a, k)] for a, k in zip(attrs, keys)]
+                add(values, _bits(bitmap))
+
+        else:
+            for columns in self._blocks:
+                if columns.fallback is not None:
+                    groups_of_block = columns.fallback._groups(attrs)
+                    for key, (value, indices) in groups_of_block.items():
+                        if key not in groups:
+                            groups[key] = (value, [])
+                        groups[key][1].extend(
+                            columns.offset + j for j in indices
+                        )
+                    continue
+                if any(
+                    a not in columns.constants and a not in columns.along
+                    for a in attrs
+                ):
+                    continue
+                axes = sorted(
+                    set(
+                        columns.along[a][0] for a in attrs if a in columns.along
+                    )
+                )
+                sizes = [columns.block.sizes[k] for k in axes]
+                for positions in product(*(range(s) for s in sizes)):
+                    position = dict(zip(axes, positions))
+                    values = [
+                        (
+                            columns.constants[a]
+                            if a in columns.constants
+                            else columns.along[a][1][
+                                position[columns.along[a][0]]
+                            ]
+                        )
+                        for a in attrs
+                    ]
+                    allowed = [range(s) for s in columns.block.sizes]
+                    for k, j in position.items():
+                        allowed[k] = [j]
+                    add(values, columns.indices(allowed))
+
+        return groups
+
+    def __repr__(self) -> str:
+        kind = "grid" if self._blocks is not None else "bitmaps"
+        return f"GridIndex(len={len(self)}, {kind})"
@@ -0,0 +1,269 @@
+import os
+import time
+import shlex
+import asyncio
+import argparse
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+
+class LaunchEvent(NamedTuple):
+    """Completion of the command of a single configuration.
+
+    Attributes:
+        index: index of the configuration in the grid.
+        slot: worker slot the command ran on.
+        argv: the command that was run.
+        returncode: exit code of the command, `None` if it couldn't start.
+        started: time the command started (as in `time.time`).
+        finished: time the command finished (as in `time.time`).
+        namespace: the configuration.
+        error: why the command couldn't start, if it couldn't.
+    """
+
+    index: int
+    slot: int
+    argv: List[str]
+    returncode: Optional[int]
+    started: float
+    finished: float
+    namespace: argparse.Namespace
+    error: Optional[str] = None
+
+
+Template = Union[str, Sequence[str], Callable[..., Sequence[str]]]
+
+
+def format_command(
+    template: Template,
+    namespace: argparse.Namespace,
+    argv: Optional[List[str]] = None,
+    **kwargs,
+) -> List[str]:
+    """Creates the command of a configuration from a template.
+
+    Args:
+        template: a string (split like a shell would) or a list of
+            tokens, each formatted with the values of the configuration,
+            e.g. `"python train.py --lr {lr}"`. Can also be a function
+            that receives the namespace and `kwargs` and returns the command.
+        namespace: the configuration.
+        argv: the command-line arguments of the configuration, which replace
+            the token `{argv}` (e.g., from `GridArgumentParser.to_argv`),
+            or are quoted and joined by spaces within a larger token.
+        kwargs: additional values for the template (e.g., `index`, `slot`),
+            overridden by the values of the configuration.
+    """
+    if callable(template):
+        return list(template(namespace, **kwargs))
+    if isinstance(template, str):
+        template = shlex.split(template)
+    values = dict(kwargs, **vars(namespace))
+    if argv is not None:
+        # `{argv}` within a token is replaced with the quoted arguments
+        values.setdefault("argv", " ".join(shlex.quote(a) for a in argv))
+
+    command = []
+    for token in template:
+        if token == "{argv}" and argv is not None:
+            command.extend(argv)
+        else:
+            command.append(token.format(**values))
+    return command
+
+
+async def _aenumerate(configs: Union[Iterable, AsyncIterable]):
+    index = 0
+    if hasattr(configs, "__aiter__"):
+        async for config in configs:
+            yield index, config
+            index += 1
+    else:
+        for config in configs:
+            yield index, config
+            index += 1
+            # don't starve the event loop with long grids
+            await asyncio.sleep(0)
+
+
+def _slot_env(
+    slot: int,
+    slot_env: Optional[
+        Union[Sequence[Dict[str, str]], Callable[[int], Dict[str, str]]]
+    ],
+    cpus_per_slot: Optional[int],
+) -> Dict[str, str]:
+    env = dict(os.environ)
+    if cpus_per_slot is not None:
+        env["OMP_NUM_THREADS"] = str(cpus_per_slot)
+    if callable(slot_env):
+        env.update(slot_env(slot))
+    elif slot_env is not None:
+        env.update(slot_env[slot])
+    return env
+
+
+async def launch_grid(
+    configs: Union[Iterable, AsyncIterable],
+    template: Template,
+    concurrency: int = 1,
+    slot_env: Optional[
+        Union[Sequence[Dict[str, str]], Callable[[int], Dict[str, str]]]
+    ] = None,
+    cpus_per_slot: Optional[int] = None,
+    indices: Optional[Union[Iterable[int], AsyncIterable[int]]] = None,
+    parser=None,
+    **subprocess_kwargs: Any,
+) -> AsyncIterator[LaunchEvent]:
+    """Runs a command for each configuration with `asyncio` subprocesses,
+    with at most `concurrency` of them running at any time.
+
+    Each running command occupies one of `concurrency` worker slots,
+    which determine its environment. Completion events are yielded
+    as soon as each command finishes, and closing the generator
+    kills the commands that are still running.
+
+    Example:
+        ```
+        async for event in launch_grid(
+            parser.aiter_grid(argv),
+            "python train.py --lr {lr} --seed {index}",
+            concurrency=4,
+            cpus_per_slot=8,
+        ):
+            print(event.index, event.returncode)
+        ```
+
+    Args:
+        configs: the configurations, e.g. a `Grid`
+            or `GridArgumentParser.aiter_grid`.
+        template: the command of each configuration, see `format_command`.
+            `{index}` and `{slot}` can also be used in it.
+        concurrency: number of worker slots.
+        slot_env: environment variables of each slot, as a list
+            with one mapping per slot or as a function of the slot.
+        cpus_per_slot: if provided, pins each slot to its own CPUs
+            with `taskset` and sets `OMP_NUM_THREADS` accordingly.
+        indices: if provided, only these configurations are run,
+            with `configs` indexed directly (e.g., to resume a `Grid`),
+            possibly from an async iterable (e.g., `FileWorkQueue.aclaims`).
+        parser: if provided, `{argv}` in the template is replaced with
+            the arguments of each configuration from `parser.to_argv`.
+        subprocess_kwargs: passed to `asyncio.create_subprocess_exec`
+            (e.g., `stdout`, `cwd`).
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+
+    # the free slots, also limiting how many commands run concurrently
+    slots = asyncio.Queue()
+    for slot in range(concurrency):
+        slots.put_nowait(slot)
+
+    events = asyncio.Queue()
+    processes = {}
+
+    def command(index: int, namespace: argparse.Namespace, slot: int):
+        argv = format_command(
+            template,
+            namespace,
+            argv=parser.to_argv(namespace) if parser is not None else None,
+            index=index,
+            slot=slot,
+        )
+        if cpus_per_slot is not None:
+            cpus = range(slot * cpus_per_slot, (slot + 1) * cpus_per_slot)
+            cpus = ",".join(str(cpu) for cpu in cpus)
+            argv = ["taskset", "-c", cpus] + argv
+        return argv
+
+    async def run(index: int, namespace: argparse.Namespace, slot: int):
+        started = time.time()
+        argv, returncode, error = [], None, None
+        try:
+            argv = command(index, namespace, slot)
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                env=_slot_env(slot, slot_env, cpus_per_slot),
+                **subprocess_kwargs,
+            )
+            processes[index] = process
+            returncode = await process.wait()
+        except OSError as err:
+            error = str(err)
+        except Exception as err:
+            # e.g. unknown fields in the template
+            error = f"cannot create the command: {type(err).__name__}: {err}"
+        finally:
+            processes.pop(index, None)
+            slots.put_nowait(slot)
+
+        await events.put(
+            LaunchEvent(
+                index=index,
+                slot=slot,
+                argv=argv,
+                returncode=returncode,
+                started=started,
+                finished=time.time(),
+                namespace=namespace,
+                error=error,
+            )
+        )
+
+    async def feed():
+        tasks = []
+        try:
+            if indices is None:
+                items = _aenumerate(configs)
+            elif hasattr(indices, "__aiter__"):
+                items = ((i, configs[i]) async for i in indices)
+            else:
+                items = _aenumerate((i, configs[i]) for i in indices)
+                items = (item async for _, item in items)
+            items = items.__aiter__()
+            while True:
+                # take the next configuration only when a slot is free,
+                # e.g. to not claim it from a work queue too early
+                slot = await slots.get()
+                try:
+                    index, namespace = await items.__anext__()
+                except StopAsyncIteration:
+                    break
+                tasks.append(asyncio.ensure_future(run(index, namespace, slot)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await events.put(None)
+
+    feeder = asyncio.ensure_future(feed())
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+        # surface errors of the configurations
+        await feeder
+    finally:
+        feeder.cancel()
+        running = [p for p in processes.values() if p.returncode is None]
+        for process in running:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        for process in running:
+            await process.wait()
@@ -0,0 +1,232 @@
+import abc
+import math
+import argparse
+from bisect import bisect_right
+from typing import Any, Callable, Optional, Sequence
+
+
+def _is_integer(value: float) -> bool:
+    """Whether a float is an integer, up to rounding errors."""
+    return abs(value - round(value)) <= 1e-9 * max(1.0, abs(value))
+
+
+class ValueRange(Sequence, abc.ABC):
+    """Lazy sequence of numeric values with a known length,
+    generated from a compact specification in the command line.
+
+    Args:
+        num: number of values.
+        type: function applied to each generated value.
+    """
+
+    def __init__(self, num: int, type: Optional[Callable] = None):
+        if num < 0:
+            raise ValueError("Number of values must be non-negative.")
+        self.num = num
+        self.type = type
+
+    def __len__(self) -> int:
+        return self.num
+
+    @abc.abstractmethod
+    def _value(self, i: int) -> Any:
+        """The `i`-th value, before `type` is applied."""
+
+    def is_integral(self) -> bool:
+        """Whether all values are integers (before `type` is applied)."""
+        return all(_is_integer(self._value(i)) for i in range(self.num))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.num))]
+        if i < 0:
+            i += self.num
+        if not 0 <= i < self.num:
+            raise IndexError("range index out of range")
+
+        value = self._value(i)
+        if self.type is int and isinstance(value, float):
+            # avoid truncating values like 99.99999999999997
+            return int(round(value))
+        if self.type is not None:
+            return self.type(value)
+        return value
+
+
+class LinearRange(ValueRange):
+    """`num` evenly spaced values from `start` to `stop` (inclusive),
+    specified as `lin:START:STOP:NUM`."""
+
+    def __init__(
+        self,
+        start: float,
+        stop: float,
+        num: int,
+        type: Optional[Callable] = None,
+    ):
+        super().__init__(num, type)
+        self.start = start
+        self.stop = stop
+
+    def _value(self, i: int) -> float:
+        if i == 0:
+            return self.start
+        if i == self.num - 1:
+            return self.stop
+        return self.start + i * (self.stop - self.start) / (self.num - 1)
+
+    def is_integral(self) -> bool:
+        if not _is_integer(self.start):
+            return False
+        return self.num < 2 or _is_integer(
+            (self.stop - self.start) / (self.num - 1)
+        )
+
+    def __repr__(self) -> str:
+        return f"LinearRange({self.start}, {self.stop}, {self.num})"
+
+
+class LogRange(ValueRange):
+    """`num` values from `start` to `stop` (inclusive), evenly spaced
+    in log scale, specified as `log:START:STOP:NUM`."""
+
+    def __init__(
+        self,
+        start: float,
+        stop: float,
+        num: int,
+        type: Optional[Callable] = None,
+    ):
+        if start <= 0 or stop <= 0:
+            raise ValueError("Log ranges must have positive endpoints.")
+        super().__init__(num, type)
+        self.start = start
+        self.stop = stop
+        self._log_start = math.log10(start)
+        self._log_stop = math.log10(stop)
+
+    def _value(self, i: int) -> float:
+        if i == 0:
+            return self.start
+        if i == self.num - 1:
+            return self.stop
+        step = (self._log_stop - self._log_start) / (self.num - 1)
+        return 10 ** (self._log_start + i * step)
+
+    def __repr__(self) -> str:
+        return f"LogRange({self.start}, {self.stop}, {self.num})"
+
+
+class IntRange(ValueRange):
+    """Integers from `start` to `stop` (exclusive) with step `step`,
+    like `range`, specified as `range:START:STOP[:STEP]`."""
+
+    def __init__(
+        self,
+        start: int,
+        stop: int,
+        step: int = 1,
+        type: Optional[Callable] = None,
+    ):
+        self._range = range(start, stop, step)
+        super().__init__(len(self._range), type)
+        self.start = start
+        self.stop = stop
+        self.step = step
+
+    def _value(self, i: int) -> int:
+        return self._range[i]
+
+    def is_integral(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return f"IntRange({self.start}, {self.stop}, {self.step})"
+
+
+def accepts_ranges(type: Optional[Callable]) -> bool:
+    """Whether values of an argument of type `type` can be given as ranges:
+    `int` and `float`, and types with a truthy `accepts_ranges` attribute.
+    Other types (e.g., `str`, or no type) take the strings as they are."""
+    return type in (int, float) or bool(getattr(type, "accepts_ranges", False))
+
+
+def parse_range(
+    arg_string: str, type: Optional[Callable] = None
+) -> Optional[ValueRange]:
+    """Parses `lin:START:STOP:NUM`, `log:START:STOP:NUM`
+    and `range:START:STOP[:STEP]` specifications.
+
+    Args:
+        arg_string: the string from the command line.
+        type: function applied to each generated value.
+
+    Returns:
+        The lazy range, or `None` if `arg_string`
+        is not a range specification.
+
+    Raises:
+        argparse.ArgumentTypeError: if the specification is malformed.
+    """
+    kind, _, spec = arg_string.partition(":")
+    if kind not in ("lin", "log", "range") or not spec:
+        return None
+
+    parts = spec.split(":")
+    try:
+        if kind == "range":
+            if len(parts) not in (2, 3):
+                raise ValueError
+            return IntRange(*[int(p) for p in parts], type=type)
+
+        if len(parts) != 3:
+            raise ValueError
+        start, stop, num = float(parts[0]), float(parts[1]), int(parts[2])
+        if kind == "lin":
+            value_range = LinearRange(start, stop, num, type=type)
+        else:
+            value_range = LogRange(start, stop, num, type=type)
+
+    except ValueError:
+        usage = dict(
+            lin="lin:START:STOP:NUM",
+            log="log:START:STOP:NUM",
+            range="range:START:STOP[:STEP]",
+        )[kind]
+        raise argparse.ArgumentTypeError(
+            f"invalid range {arg_string!r}, expected {usage}"
+        )
+
+    if type is int and not value_range.is_integral():
+        raise argparse.ArgumentTypeError(
+            f"range {arg_string!r} has non-integer values,"
+            " use range:START:STOP[:STEP] for integers"
+        )
+    return value_range
+
+
+class ValueChain(Sequence):
+    """Lazy concatenation of values and `ValueRange`s of a searchable
+    argument, e.g., for `--lr 0.5 lin:0.1:0.2:11 _None_`."""
+
+    def __init__(self, values: Sequence):
+        self.parts = [v if isinstance(v, ValueRange) else [v] for v in values]
+        self.offsets = [0]
+        for part in self.parts:
+            self.offsets.append(self.offsets[-1] + len(part))
+
+    def __len__(self) -> int:
+        return self.offsets[-1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("chain index out of range")
+        p = bisect_right(self.offsets, i) - 1
+        return self.parts[p][i - self.offsets[p]]
+
+    def __repr__(self) -> str:
+        return f"ValueChain({self.parts})"
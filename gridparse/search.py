@@ -0,0 +1,388 @@
+import os
+import json
+import math
+import random
+import argparse
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+
+class Trial(NamedTuple):
+    """A configuration handed out by `GridSearchSession.ask`.
+
+    Attributes:
+        id: identifier to pass to `GridSearchSession.tell`.
+        index: index of the configuration in the grid.
+        bracket: Hyperband bracket the trial belongs to.
+        rung: successive halving rung within the bracket.
+        resource: budget (e.g., epochs) to train the configuration for.
+        namespace: the configuration itself.
+    """
+
+    id: str
+    index: int
+    bracket: int
+    rung: int
+    resource: float
+    namespace: argparse.Namespace
+
+
+def _resource_type(parser, resource_arg: Optional[str]) -> Optional[Callable]:
+    """The type of the argument the resource is set as, if any."""
+    if resource_arg is None:
+        return None
+    for action in parser._actions:
+        if action.dest == resource_arg:
+            return parser._registry_get("type", action.type, action.type)
+    return None
+
+
+class GridSearchSession:
+    """Ask/tell successive halving and Hyperband over a grid.
+
+    Configurations are sampled by index from the (lazy) grid of the parser,
+    so the grid is never built in full. `ask` hands out a `Trial`, and `tell`
+    reports its score. Once every configuration of a rung has been scored,
+    the best `1 / eta` of them are promoted to the next rung with `eta` times
+    the resource. With `method="hyperband"`, all the brackets of Hyperband are
+    run, and `ask` hands out trials from any bracket that has some available.
+
+    Example:
+        ```
+        session = GridSearchSession(
+            parser, argv, max_resource=27, resource_arg="epochs",
+            state_path="session.json",
+        )
+        while not session.finished:
+            trial = session.ask()
+            if trial is None:
+                # all available trials are running (e.g., in other workers),
+                # and the next rung needs their scores
+                time.sleep(60)
+                continue
+            session.tell(trial.id, train(trial.namespace))
+        ```
+
+    Args:
+        parser: `GridArgumentParser` that describes the grid.
+        args: command-line arguments of the grid, defaults to `sys.argv[1:]`.
+        max_resource: maximum resource of a single configuration.
+        min_resource: minimum resource of a single configuration.
+        eta: reduction factor between rungs.
+        method: `"hyperband"` or `"successive_halving"`.
+        n_configs: number of configurations to start successive halving with,
+            defaults to as many as needed to have one in the last rung. Only
+            for `method="successive_halving"`, as the brackets of Hyperband
+            start with a fixed number of configurations each.
+        mode: whether higher (`"max"`) or lower (`"min"`) scores are better.
+        resource_arg: if provided, the resource of each trial is set
+            as this attribute in its namespace, converted with the type
+            of the argument (e.g., `3` instead of `3.0` for `type=int`).
+        seed: seed used to sample configurations.
+        state_path: if provided, the state of the session is saved there
+            after every `ask` and `tell`.
+    """
+
+    def __init__(
+        self,
+        parser,
+        args: Optional[Sequence[str]] = None,
+        max_resource: float = 81,
+        min_resource: float = 1,
+        eta: int = 3,
+        method: str = "hyperband",
+        n_configs: Optional[int] = None,
+        mode: str = "max",
+        resource_arg: Optional[str] = None,
+        seed: Optional[int] = None,
+        state_path: Optional[str] = None,
+    ):
+        if method not in ("hyperband", "successive_halving"):
+            raise ValueError(f"Unknown method {method!r}.")
+        if n_configs is not None and method != "successive_halving":
+            raise ValueError(
+                "n_configs is only supported with method='successive_halving'."
+            )
+        if mode not in ("max", "min"):
+            raise ValueError(f"Unknown mode {mode!r}.")
+        if eta < 2:
+            raise ValueError("eta must be at least 2.")
+        if not 0 < min_resource <= max_resource:
+            raise ValueError("Resources must satisfy 0 < min <= max.")
+
+        if args is None:
+            args = argparse._sys.argv[1:]
+
+        self.args = list(args)
+        self.max_resource = max_resource
+        self.min_resource = min_resource
+        self.eta = eta
+        self.method = method
+        self.n_configs = n_configs
+        self.mode = mode
+        self.resource_arg = resource_arg
+        self.seed = seed
+        self.state_path = state_path
+
+        self.grid = parser.parse_grid(self.args)
+        self._resource_type = _resource_type(parser, resource_arg)
+        self.brackets = self._init_brackets(random.Random(seed))
+        for bracket in self.brackets:
+            for rung in bracket["rungs"]:
+                try:
+                    self._resource_value(rung["resource"])
+                except (TypeError, ValueError):
+                    raise ValueError(
+                        f"Resource {rung['resource']} is not a valid value "
+                        f"of {resource_arg}, choose resources and eta "
+                        "so that every rung has a valid one."
+                    )
+        self.trials: Dict[str, Dict[str, Any]] = {}
+        for b, bracket in enumerate(self.brackets):
+            self._add_trials(b, 0, bracket["rungs"][0]["configs"])
+
+        self._save()
+
+    def _init_brackets(self, rng: random.Random) -> List[Dict[str, Any]]:
+        """Samples the configurations of the first rung of each bracket."""
+        s_max = int(
+            math.log(self.max_resource / self.min_resource, self.eta) + 1e-9
+        )
+
+        if self.method == "successive_halving":
+            n = self.n_configs or self.eta**s_max
+            brackets = [(s_max, n)]
+        else:
+            brackets = [
+                (s, math.ceil((s_max + 1) * self.eta**s / (s + 1)))
+                for s in range(s_max, -1, -1)
+            ]
+
+        grid_size = len(self.grid)
+        if not grid_size:
+            raise ValueError("Cannot search over an empty grid.")
+
+        states = []
+        for s, n in brackets:
+            n = min(n, grid_size)
+            resource = self.max_resource / self.eta**s
+            rungs = []
+            for _ in range(s + 1):
+                rungs.append(
+                    dict(resource=resource, size=max(n, 1), configs=[])
+                )
+                n //= self.eta
+                resource *= self.eta
+            rungs[0]["configs"] = rng.sample(range(grid_size), rungs[0]["size"])
+            states.append(dict(s=s, rungs=rungs))
+
+        return states
+
+    def _add_trials(self, bracket: int, rung: int, configs: List[int]):
+        for index in configs:
+            trial_id = f"{bracket}-{rung}-{index}"
+            self.trials[trial_id] = dict(
+                bracket=bracket,
+                rung=rung,
+                index=index,
+                status="pending",
+                score=None,
+            )
+
+    def _resource_value(self, resource: float) -> Any:
+        """Converts a resource to the type of `resource_arg`."""
+        if float(resource).is_integer():
+            resource = int(resource)
+        if self._resource_type is None:
+            return resource
+        return self._resource_type(str(resource))
+
+    def _trial(self, trial_id: str) -> Trial:
+        state = self.trials[trial_id]
+        resource = self.brackets[state["bracket"]]["rungs"][state["rung"]][
+            "resource"
+        ]
+        namespace = self.grid[state["index"]]
+        if self.resource_arg is not None:
+            setattr(
+                namespace, self.resource_arg, self._resource_value(resource)
+            )
+        return Trial(
+            id=trial_id,
+            index=state["index"],
+            bracket=state["bracket"],
+            rung=state["rung"],
+            resource=resource,
+            namespace=namespace,
+        )
+
+    @property
+    def finished(self) -> bool:
+        """Whether all trials of all brackets have been scored."""
+        return all(t["status"] == "done" for t in self.trials.values())
+
+    def ask(self) -> Optional[Trial]:
+        """Returns the next configuration to evaluate, or `None` if
+        none is available until pending trials are scored (or if the
+        search has finished)."""
+        for trial_id, state in self.trials.items():
+            if state["status"] == "pending":
+                state["status"] = "running"
+                self._save()
+                return self._trial(trial_id)
+        return None
+
+    def tell(self, trial_id: Union[str, Trial], score: float):
+        """Reports the score of a trial, promoting the best
+        configurations of its rung if the rung is complete.
+
+        Args:
+            trial_id: `id` of the trial (or the `Trial` itself).
+            score: score of the trial.
+
+        Raises:
+            KeyError: if the trial doesn't exist.
+            ValueError: if the trial has already been scored.
+        """
+        if isinstance(trial_id, Trial):
+            trial_id = trial_id.id
+        state = self.trials[trial_id]
+        if state["status"] == "done":
+            raise ValueError(f"Trial {trial_id} has already been scored.")
+
+        state["status"] = "done"
+        state["score"] = float(score)
+        self._promote(state["bracket"], state["rung"])
+        self._save()
+
+    def _promote(self, bracket: int, rung: int):
+        rungs = self.brackets[bracket]["rungs"]
+        if rung + 1 >= len(rungs) or rungs[rung + 1]["configs"]:
+            return
+
+        scores = []
+        for index in rungs[rung]["configs"]:
+            state = self.trials[f"{bracket}-{rung}-{index}"]
+            if state["status"] != "done":
+                return
+            scores.append((state["score"], index))
+
+        scores.sort(key=lambda x: x[0], reverse=self.mode == "max")
+        configs = [index for _, index in scores[: rungs[rung + 1]["size"]]]
+        rungs[rung + 1]["configs"] = configs
+        self._add_trials(bracket, rung + 1, configs)
+
+    def best(self) -> Optional[Tuple[Trial, float]]:
+        """Returns the best scored trial among the ones trained
+        with the largest resource, and its score."""
+        done = [
+            (trial_id, state)
+            for trial_id, state in self.trials.items()
+            if state["status"] == "done"
+        ]
+        if not done:
+            return None
+
+        def key(item):
+            trial_id, state = item
+            resource = self.brackets[state["bracket"]]["rungs"][state["rung"]][
+                "resource"
+            ]
+            score = state["score"]
+            return resource, score if self.mode == "max" else -score
+
+        trial_id, state = max(done, key=key)
+        return self._trial(trial_id), state["score"]
+
+    def state_dict(self) -> Dict[str, Any]:
+        """Returns the JSON-serializable state of the session."""
+        return dict(
+            args=self.args,
+            max_resource=self.max_resource,
+            min_resource=self.min_resource,
+            eta=self.eta,
+            method=self.method,
+            n_configs=self.n_configs,
+            mode=self.mode,
+            resource_arg=self.resource_arg,
+            seed=self.seed,
+            grid_size=len(self.grid),
+            brackets=self.brackets,
+            trials=self.trials,
+        )
+
+    def save(self, path: Optional[str] = None):
+        """Saves the state of the session to `path`
+        (defaults to `state_path`) atomically."""
+        path = path or self.state_path
+        if path is None:
+            raise ValueError("No path to save the session to.")
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(self.state_dict(), fp)
+        os.replace(tmp_path, path)
+
+    def _save(self):
+        if self.state_path is not None:
+            self.save()
+
+    @classmethod
+    def load(
+        cls, parser, path: str, requeue: bool = True
+    ) -> "GridSearchSession":
+        """Resumes a session saved at `path`.
+
+        Args:
+            parser: the `GridArgumentParser` the session was created with.
+            path: file the session was saved to, also used to save
+                the resumed session.
+            requeue: whether to hand out again the trials that were
+                asked but not told before the session was saved.
+
+        Raises:
+            ValueError: if the grid of the parser has changed.
+        """
+        with open(path) as fp:
+            state = json.load(fp)
+
+        session = cls.__new__(cls)
+        for key in (
+            "args",
+            "max_resource",
+            "min_resource",
+            "eta",
+            "method",
+            "n_configs",
+            "mode",
+            "resource_arg",
+            "seed",
+            "brackets",
+            "trials",
+        ):
+            setattr(session, key, state[key])
+        session.state_path = path
+
+        session.grid = parser.parse_grid(session.args)
+        session._resource_type = _resource_type(parser, session.resource_arg)
+        if len(session.grid) != state["grid_size"]:
+            raise ValueError(
+                f"Grid has {len(session.grid)} configurations, "
+                f"but the session was created with {state['grid_size']}."
+            )
+
+        if requeue:
+            for trial in session.trials.values():
+                if trial["status"] == "running":
+                    trial["status"] = "pending"
+
+        return session
@@ -1,5 +1,5 @@
 import argparse
-from typing import Callable
+from typing import Any, Callable, Hashable
 
 
 # NOTE: has issues with negative numbers if delim="-"
@@ -23,6 +23,10 @@ def list_as_delim_str(actual_type: Callable, delimiter: str = ","):
         l = [actual_type(e) for e in s.split(delimiter)]
         return l
 
+    # used to convert values back to strings
+    _list_of_lists.actual_type = actual_type
+    _list_of_lists.delimiter = delimiter
+
     return _list_of_lists
 
 
@@ -50,3 +54,27 @@ def strbool(arg: str):
     if arg.lower() == 'false':
         return False
     raise argparse.ArgumentTypeError('Boolean value expected.')
+
+
+def _freeze(value: Any, typed: bool = True) -> Hashable:
+    """Converts a value to a hashable one for set operations
+    and dictionary keys (lists become tuples, etc.).
+
+    Args:
+        value: the value.
+        typed: whether to tell apart values that are equal in Python
+            but different in the command line (e.g., 1, 1.0 and True).
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v, typed) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v, typed)) for k, v in value.items()))
+    if isinstance(value, set):
+        return frozenset(_freeze(v, typed) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    if typed:
+        return type(value).__name__, value
+    return value
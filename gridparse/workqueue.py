@@ -0,0 +1,366 @@
+import os
+import json
+import asyncio
+import time
+import uuid
+import socket
+import threading
+from contextlib import contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Iterator,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+try:
+    import fcntl
+except ImportError:  # not POSIX
+    fcntl = None
+
+
+class FileWorkQueue:
+    """Work queue over the configurations of a grid, kept as files in a
+    directory shared by all workers (e.g., over NFS), so that workers on
+    any number of nodes pull the next configuration when they are free,
+    without a central service.
+
+    A configuration is claimed by atomically creating its lease file
+    (`os.open` with `O_CREAT | O_EXCL`). Workers renew their leases by
+    updating the modification time of the lease files from a background
+    thread, and leases that have not been renewed for `lease_timeout`
+    seconds are reclaimed from their (presumably dead) workers, so the
+    clocks of the nodes must roughly agree. Reclaiming a lease holds an
+    `fcntl.flock` lock of the configuration, so it requires POSIX (and
+    a filesystem that supports locks). Finished configurations are
+    recorded in `done/` and never claimed again.
+
+    Example:
+        ```
+        grid = parser.parse_grid(argv)
+        with FileWorkQueue("/shared/sweep", grid) as queue:
+            for i, namespace in queue.items():
+                queue.complete(i, train(namespace))
+        ```
+
+    Args:
+        directory: the shared directory, created if it doesn't exist.
+        configs: the configurations, e.g. a `Grid`. Only their number
+            and indexed access are used.
+        lease_timeout: seconds without heartbeats after which
+            a lease is reclaimed.
+        heartbeat_interval: seconds between heartbeats,
+            defaults to a third of `lease_timeout`.
+        worker_id: name of the worker in the lease files,
+            defaults to one based on the host name and the process.
+        argv: the command-line arguments of the grid, if provided,
+            recorded in the directory to refuse workers of other grids.
+
+    Raises:
+        ValueError: if the directory holds the queue of a different
+            number of configurations, or of different arguments.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        configs: Sequence,
+        lease_timeout: float = 300.0,
+        heartbeat_interval: Optional[float] = None,
+        worker_id: Optional[str] = None,
+        argv: Optional[Sequence[str]] = None,
+    ):
+        if lease_timeout <= 0:
+            raise ValueError("lease_timeout must be positive.")
+        if fcntl is None:
+            raise OSError("FileWorkQueue requires `fcntl` (POSIX).")
+
+        self.directory = directory
+        self.configs = configs
+        self.size = len(configs)
+        self.argv = list(argv) if argv is not None else None
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval or lease_timeout / 3
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+
+        self._leases_dir = os.path.join(directory, "leases")
+        self._done_dir = os.path.join(directory, "done")
+        os.makedirs(self._leases_dir, exist_ok=True)
+        os.makedirs(self._done_dir, exist_ok=True)
+        self._check_grid()
+
+        # next index that hasn't been tried by this worker
+        self._cursor = 0
+        self._held: Set[int] = set()
+        self.lost: Set[int] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeats: Optional[threading.Thread] = None
+
+    def _check_grid(self):
+        """Records the number of configurations (and the arguments) of the
+        grid in the directory, or checks them against the recorded ones."""
+        path = os.path.join(self.directory, "queue.json")
+        tmp_path = f"{path}.{self.worker_id}.tmp"
+        with open(tmp_path, "w") as fp:
+            json.dump(dict(argv=self.argv, size=self.size), fp)
+        try:
+            # fails if it exists, and the file is complete if it doesn't
+            os.link(tmp_path, path)
+        except FileExistsError:
+            with open(path) as fp:
+                header = json.load(fp)
+            if header["size"] != self.size:
+                raise ValueError(
+                    f"{self.directory} holds a queue of {header['size']} "
+                    f"configurations, not {self.size}."
+                )
+            argv = header.get("argv")
+            if None not in (argv, self.argv) and argv != self.argv:
+                raise ValueError(
+                    f"{self.directory} holds the queue of the grid "
+                    f"{' '.join(argv)!r}, not {' '.join(self.argv)!r}."
+                )
+        finally:
+            os.unlink(tmp_path)
+
+    def _lease_path(self, i: int) -> str:
+        return os.path.join(self._leases_dir, str(i))
+
+    def _done_path(self, i: int) -> str:
+        return os.path.join(self._done_dir, str(i))
+
+    def _try_lease(self, i: int) -> bool:
+        try:
+            fd = os.open(
+                self._lease_path(i), os.O_CREAT | os.O_EXCL | os.O_WRONLY
+            )
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as fp:
+            json.dump(dict(worker=self.worker_id, claimed=time.time()), fp)
+
+        with self._lock:
+            self._held.add(i)
+        self._start_heartbeats()
+        return True
+
+    def _owns(self, i: int) -> bool:
+        """Whether the lease of configuration `i` is of this worker."""
+        try:
+            with open(self._lease_path(i)) as fp:
+                return json.load(fp)["worker"] == self.worker_id
+        except (FileNotFoundError, ValueError):
+            # missing, or being written by another worker
+            return False
+
+    @contextmanager
+    def _locked(self, i: int):
+        """Holds the lock of configuration `i`, which serializes reclaiming
+        and releasing its lease across workers."""
+        with open(f"{self._lease_path(i)}.lock", "a") as fp:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+    def _is_stale(self, i: int) -> Optional[bool]:
+        """Whether the lease of configuration `i` is stale and the
+        configuration is unfinished, `None` if there is no lease."""
+        try:
+            age = time.time() - os.stat(self._lease_path(i)).st_mtime
+        except FileNotFoundError:
+            return None
+        return age >= self.lease_timeout and not os.path.exists(
+            self._done_path(i)
+        )
+
+    def _reclaim(self, i: int) -> bool:
+        """Claims configuration `i` if its lease is missing or stale."""
+        if i in self._held:
+            return False
+
+        stale = self._is_stale(i)
+        if stale is None:
+            return self._try_lease(i)
+        if not stale:
+            return False
+
+        # check again under the lock, as another worker
+        # may have reclaimed it in the meantime
+        with self._locked(i):
+            stale = self._is_stale(i)
+            if stale is False:
+                return False
+            if stale:
+                os.unlink(self._lease_path(i))
+            return self._try_lease(i)
+
+    def claim(self) -> Optional[int]:
+        """Claims the next configuration, trying the ones that have not
+        been claimed first, and then the unfinished ones with missing
+        or stale leases.
+
+        Returns:
+            The index of the configuration, or `None` if all of them
+            are finished or leased by live workers.
+        """
+        while self._cursor < self.size:
+            i = self._cursor
+            self._cursor += 1
+            if self._try_lease(i):
+                return i
+
+        done = self.done_indices()
+        for i in range(self.size):
+            if i not in done and self._reclaim(i):
+                return i
+        return None
+
+    def claims(
+        self, wait: bool = False, poll_interval: Optional[float] = None
+    ) -> Iterator[int]:
+        """Yields the indices of claimed configurations, which
+        should be passed to `complete` (or `release`) when done.
+
+        Args:
+            wait: whether to keep polling until all configurations
+                are finished, to reclaim the leases of workers
+                that die, instead of stopping when nothing is left
+                to claim.
+            poll_interval: seconds between polls when waiting,
+                defaults to `heartbeat_interval`.
+        """
+        while True:
+            i = self.claim()
+            if i is not None:
+                yield i
+            elif not wait or self.finished:
+                return
+            else:
+                time.sleep(poll_interval or self.heartbeat_interval)
+
+    async def aclaims(
+        self, wait: bool = False, poll_interval: Optional[float] = None
+    ) -> AsyncIterator[int]:
+        """Like `claims`, but waits without blocking the event loop,
+        e.g. for `launch_grid` to record completions in the meantime."""
+        while True:
+            i = self.claim()
+            if i is not None:
+                yield i
+            elif not wait or self.finished:
+                return
+            else:
+                await asyncio.sleep(poll_interval or self.heartbeat_interval)
+
+    def items(self, wait: bool = False) -> Iterator[Tuple[int, Any]]:
+        """Like `claims`, but also yields the configuration."""
+        for i in self.claims(wait=wait):
+            yield i, self.configs[i]
+
+    def complete(self, i: int, returncode: int = 0):
+        """Records that configuration `i` finished, with its exit code."""
+        path = self._done_path(i)
+        tmp_path = f"{path}.{self.worker_id}.tmp"
+        with open(tmp_path, "w") as fp:
+            record = dict(
+                worker=self.worker_id,
+                returncode=returncode,
+                finished=time.time(),
+            )
+            json.dump(record, fp)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._held.discard(i)
+
+    def release(self, i: int):
+        """Gives up configuration `i` without finishing it,
+        so that any worker can claim it again."""
+        with self._lock:
+            held = i in self._held
+            self._held.discard(i)
+        if not held:
+            return
+        with self._locked(i):
+            # the lease may have been reclaimed since the last heartbeat
+            if self._owns(i):
+                os.unlink(self._lease_path(i))
+
+    def heartbeat(self):
+        """Renews the leases of this worker. Leases that were reclaimed
+        by other workers in the meantime are moved to `lost`."""
+        with self._lock:
+            held = list(self._held)
+        for i in held:
+            if self._owns(i):
+                try:
+                    os.utime(self._lease_path(i))
+                    continue
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                if i in self._held:
+                    self._held.discard(i)
+                    self.lost.add(i)
+
+    def _start_heartbeats(self):
+        if self._heartbeats is not None:
+            return
+
+        def beat():
+            while not self._stop.wait(self.heartbeat_interval):
+                self.heartbeat()
+
+        self._stop.clear()
+        self._heartbeats = threading.Thread(target=beat, daemon=True)
+        self._heartbeats.start()
+
+    def close(self):
+        """Stops the heartbeats and releases the unfinished
+        configurations of this worker."""
+        if self._heartbeats is not None:
+            self._stop.set()
+            self._heartbeats.join()
+            self._heartbeats = None
+        with self._lock:
+            held = list(self._held)
+        for i in held:
+            self.release(i)
+
+    def __enter__(self) -> "FileWorkQueue":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def done_indices(self) -> Set[int]:
+        """Indices of the finished configurations, by any worker."""
+        return set(
+            int(name) for name in os.listdir(self._done_dir) if name.isdigit()
+        )
+
+    def returncodes(self) -> dict:
+        """Exit codes of the finished configurations, by index."""
+        returncodes = {}
+        for i in self.done_indices():
+            with open(self._done_path(i)) as fp:
+                returncodes[i] = json.load(fp)["returncode"]
+        return returncodes
+
+    @property
+    def finished(self) -> bool:
+        return len(self.done_indices()) >= self.size
+
+    def __repr__(self) -> str:
+        return (
+            f"FileWorkQueue({self.directory!r}, size={self.size}, "
+            f"worker_id={self.worker_id!r})"
+        )
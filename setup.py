@@ -12,7 +12,8 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/gchochla/gridparse",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*"]),
     install_requires=["omegaconf"],
     extras_require={"dev": ["black", "pytest"]},
+    entry_points={"console_scripts": ["gridparse=gridparse.cli:main"]},
 )
@@ -0,0 +1,99 @@
+import argparse
+
+import pytest
+
+from gridparse import GridArgumentParser
+
+
+def add_one_by_one(parser, n):
+    for i in range(n):
+        parser.add_argument(
+            f"--arg{i}", type=float, searchable=True, splits=["train", "test"]
+        )
+        parser.add_argument(f"--flag_{i}", type=bool)
+
+
+def add_in_bulk(parser, n):
+    specs = {}
+    for i in range(n):
+        specs[f"--arg{i}"] = dict(
+            type=float, searchable=True, splits=["train", "test"]
+        )
+        specs[f"--flag_{i}"] = dict(type=bool)
+    return parser.add_arguments(specs)
+
+
+def test_same_as_add_argument():
+    parser, bulk_parser = GridArgumentParser(), GridArgumentParser()
+    add_one_by_one(parser, 5)
+    actions = add_in_bulk(bulk_parser, 5)
+    assert len(actions) == 5 * 3
+
+    argv = "--train-arg3 1 2 --test-arg3 4 --flag_3 true".split()
+    assert [vars(ns) for ns in parser.parse_args(argv)] == [
+        vars(ns) for ns in bulk_parser.parse_args(argv)
+    ]
+    assert parser._grid_args == bulk_parser._grid_args
+    assert parser.format_help() == bulk_parser.format_help()
+
+
+def test_sequence_of_specs():
+    parser = GridArgumentParser()
+    parser.add_arguments(
+        [
+            dict(args=["-v", "--verbose"], action="store_true"),
+            dict(args="--lr", type=float, searchable=True),
+        ]
+    )
+    assert [vars(ns) for ns in parser.parse_args("-v --lr 1 2".split())] == [
+        dict(verbose=True, lr=1.0),
+        dict(verbose=True, lr=2.0),
+    ]
+
+
+def test_conflicts():
+    parser = GridArgumentParser()
+    with pytest.raises(argparse.ArgumentError):
+        parser.add_arguments([dict(args=["--x"]), dict(args="--x")])
+
+    parser = GridArgumentParser()
+    parser.add_argument("--x")
+    with pytest.raises(argparse.ArgumentError):
+        parser.add_arguments({"--x": {}})
+
+    parser = GridArgumentParser(conflict_handler="resolve")
+    parser.add_argument("--x")
+    parser.add_arguments({"--x": {"type": "int"}})
+    assert vars(parser.parse_args(["--x", "3"])[0]) == dict(x=3)
+
+
+def test_spec_file(tmp_path):
+    path = tmp_path / "specs.yaml"
+    path.write_text(
+        "--lr: {type: float, searchable: true}\n"
+        "--pos: {type: strbool, splits: [a, b]}\n"
+        "--z:\n"
+    )
+    parser = GridArgumentParser()
+    assert len(parser.add_arguments(str(path))) == 4
+    assert [
+        vars(ns) for ns in parser.parse_args("--lr 1 2 --a-pos true".split())
+    ] == [
+        dict(lr=1.0, a_pos=True, b_pos=False, z=None),
+        dict(lr=2.0, a_pos=True, b_pos=False, z=None),
+    ]
+
+
+def test_no_specs():
+    assert GridArgumentParser().add_arguments([]) == []
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [dict(type=argparse.FileType), dict(type="nope"), dict(action="x")],
+)
+def test_validated_like_add_argument(kwargs):
+    with pytest.raises(ValueError):
+        GridArgumentParser().add_argument("--f", **kwargs)
+    with pytest.raises(ValueError):
+        GridArgumentParser().add_arguments({"--f": kwargs})
@@ -0,0 +1,144 @@
+import os
+import json
+import sys
+
+import pytest
+
+from gridparse.cli import load_parser, main, read_state, shard_indices
+
+PARSER_MODULE = """
+from gridparse import GridArgumentParser
+
+
+def build_parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--lr", type=float, searchable=True)
+    parser.add_argument("--seed", type=int, searchable=True, default=0)
+    return parser
+"""
+
+
+@pytest.fixture(scope="module")
+def spec(tmp_path_factory):
+    path = tmp_path_factory.mktemp("cli") / "gridparse_cli_parser.py"
+    path.write_text(PARSER_MODULE)
+    return f"{path}:build_parser"
+
+
+def output(capsys):
+    return capsys.readouterr().out.split()
+
+
+def test_load_parser(spec):
+    assert load_parser(spec).parse_args(["--lr", "1"])[0].lr == 1.0
+    with pytest.raises(ValueError):
+        load_parser("no_function")
+
+
+def test_shard_indices():
+    shards = [list(shard_indices(10, 3, i)) for i in range(3)]
+    assert sorted(sum(shards, [])) == list(range(10))
+    with pytest.raises(ValueError):
+        shard_indices(10, 3, 3)
+
+
+def test_count_list_shard(spec, capsys):
+    args = ["--lr", "0.1", "0.2", "--seed", "0", "1", "2"]
+    assert main(["count", spec] + args) == 0
+    assert output(capsys) == ["6"]
+
+    assert main(["list", "--indices", spec] + args) == 0
+    assert output(capsys) == [str(i) for i in range(6)]
+
+    assert main(["list", "--format", "argv", spec, "--lr", "0.1"]) == 0
+    assert output(capsys) == ["--lr", "0.1"]
+
+    assert main(["list", "--format", "json", spec, "--lr", "0.1"]) == 0
+    assert json.loads(capsys.readouterr().out) == dict(lr=0.1, seed=0)
+
+    shard = ["shard", "--num-shards", "4", "--shard-index", "1", "--indices"]
+    assert main(shard + [spec] + args) == 0
+    assert output(capsys) == ["1", "5"]
+
+
+def exit_with_seed():
+    return ["--", sys.executable, "-c", "import sys; sys.exit({seed})"]
+
+
+def test_run_resumes(spec, tmp_path):
+    state = str(tmp_path / "state.jsonl")
+    args = ["--lr", "0.1", "--seed", "0", "1", "2"]
+    run = ["run", "--workers", "2", "--state", state, spec]
+
+    assert main(run + args + exit_with_seed()) == 1
+    with open(state) as fp:
+        header, *records = [json.loads(line) for line in fp]
+    assert header == dict(argv=args, size=3)
+    assert sorted(r["index"] for r in records) == [0, 1, 2]
+
+    # only the failed configurations run again
+    assert main(run + args + ["--", sys.executable, "-c", "pass"]) == 0
+    with open(state) as fp:
+        records = [json.loads(line) for line in fp][1:]
+    assert sorted(r["index"] for r in records) == [0, 1, 1, 2, 2]
+
+    # a different grid is refused
+    with pytest.raises(SystemExit):
+        main(run + ["--lr", "0.2"] + exit_with_seed())
+
+
+def test_read_state(tmp_path):
+    path = str(tmp_path / "state.jsonl")
+    assert read_state(path, ["--lr", "1"], 1) == set()
+    with open(path, "a") as fp:
+        fp.write(json.dumps(dict(index=0, returncode=0)) + "\n")
+        fp.write('{"index": 1, "retur')
+    assert read_state(path, ["--lr", "1"], 1) == {0}
+    with pytest.raises(ValueError):
+        read_state(path, ["--lr", "2"], 1)
+
+    with open(path, "w") as fp:
+        fp.write(json.dumps(dict(index=0, returncode=0)) + "\n")
+    with pytest.raises(ValueError):
+        read_state(path, ["--lr", "1"], 1)
+
+
+def test_work(spec, tmp_path):
+    queue = str(tmp_path / "queue")
+    args = ["--lr", "0.1", "--seed", "0", "1", "2"]
+    work = ["work", "--queue", queue, "--workers", "2", spec]
+
+    assert main(work + args + exit_with_seed()) == 1
+    with open(tmp_path / "queue" / "done" / "2") as fp:
+        assert json.load(fp)["returncode"] == 2
+
+    # finished configurations, even failed ones, are not run again
+    assert main(work + args + exit_with_seed()) == 0
+
+    with pytest.raises(SystemExit):
+        main(work + ["--lr", "0.1"] + exit_with_seed())
+    # a different grid of the same size is refused too
+    with pytest.raises(SystemExit):
+        main(work + ["--lr", "0.2"] + args[2:] + exit_with_seed())
+
+
+def test_work_waits(spec, tmp_path):
+    queue = str(tmp_path / "queue")
+    args = ["--lr", "0.1", "--seed", "0", "1", "2"]
+    work = ["work", "--queue", queue, "--workers", "2", "--wait"]
+    work += ["--lease-timeout", "1", spec]
+    assert main(work + args + ["--", sys.executable, "-c", "pass"]) == 0
+    assert sorted(os.listdir(tmp_path / "queue" / "done")) == ["0", "1", "2"]
+
+
+def test_missing_template(spec):
+    with pytest.raises(SystemExit):
+        main(["run", spec, "--lr", "0.1"])
+
+
+@pytest.mark.parametrize(
+    "shard", [["--num-shards", "2"], ["--shard-index", "1"]]
+)
+def test_incomplete_shard(spec, shard):
+    with pytest.raises(SystemExit):
+        main(["run"] + shard + [spec, "--lr", "0.1"] + exit_with_seed())
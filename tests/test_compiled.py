@@ -0,0 +1,103 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gridparse import CompiledGridParser, GridArgumentParser, GridParseError
+
+
+@pytest.fixture
+def parser():
+    parser = GridArgumentParser(prog="train")
+    parser.add_argument("--lr", type=float, searchable=True)
+    parser.add_argument("--n", type=int, required=True)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--a", action="store_true")
+    group.add_argument("--b", action="store_true")
+    subparsers = parser.add_subparsers(dest="cmd")
+    one = subparsers.add_parser("one")
+    one.add_argument("--k", type=int, required=True, searchable=True)
+    return parser
+
+
+def test_same_as_parser(parser):
+    compiled = parser.compile()
+    assert isinstance(compiled, CompiledGridParser)
+    for argv in [
+        "--n 1 --lr 0.1 0.2",
+        "--n 2 one --k 1 2",
+        "--n 1 { --lr 1 } { --lr 2 3 }",
+    ]:
+        assert [vars(ns) for ns in compiled.parse_args(argv.split())] == [
+            vars(ns) for ns in parser.parse_args(argv.split())
+        ]
+
+
+def test_errors(parser):
+    compiled = parser.compile()
+    results = compiled.parse_many(
+        [
+            ["--lr", "x"],
+            ["--n", "1", "--a", "--b"],
+            ["--n", "2", "one"],
+            ["--help"],
+            ["--n", "1", "--lr", "1"],
+        ]
+    )
+    assert [r.ok for r in results] == [False, False, False, False, True]
+    assert all(r.grid is None for r in results[:-1])
+    assert "invalid float value" in results[0].error.message
+    assert results[1].error.status == 2
+    assert results[2].error.prog == "train one"
+    assert results[3].error.status == 0
+    assert results[3].error.to_dict()["prog"] == "train"
+
+    with pytest.raises(GridParseError):
+        compiled.parse_grid(["--lr", "1"])
+
+
+def test_exit_on_error_false():
+    parser = GridArgumentParser(exit_on_error=False)
+    parser.add_argument("--n", type=int)
+    with pytest.raises(GridParseError):
+        parser.compile().parse_args(["--n", "x"])
+
+
+def test_snapshot(parser):
+    compiled = parser.compile()
+    parser.add_argument("--later")
+    assert not compiled.parse_one(["--n", "1", "--later", "x"]).ok
+    assert parser.parse_args(["--n", "1", "--later", "x"])[0].later == "x"
+
+
+def test_threads(parser):
+    compiled = parser.compile()
+    all_argv = [
+        ["--n", str(i), "--lr", *map(str, range(i % 5 + 1))] for i in range(500)
+    ]
+    results = compiled.parse_many(all_argv, max_workers=8)
+    assert [len(r.grid) for r in results] == [i % 5 + 1 for i in range(500)]
+
+    namespaces = [r.grid[-1] for r in results]
+    with ThreadPoolExecutor(8) as executor:
+        all_argv = list(executor.map(compiled.to_argv, namespaces))
+    assert all_argv == parser.to_argv_many(namespaces)
+
+
+def test_compiling_runs_no_types(tmp_path):
+    path = tmp_path / "out.txt"
+    parser = GridArgumentParser()
+    parser.add_argument("--out", type=argparse.FileType("w"), default=str(path))
+    parser.add_argument("--mode", type=int, required=True, default="auto")
+    compiled = parser.compile()
+    assert not path.exists()
+    other = tmp_path / "other.txt"
+    with open(other, "w") as fp:
+        namespace = argparse.Namespace(out=fp, mode=2)
+        assert compiled.to_argv(namespace) == [
+            "--out",
+            str(other),
+            "--mode",
+            "2",
+        ]
+    assert not path.exists()
@@ -0,0 +1,113 @@
+import pytest
+
+from gridparse import GridArgumentParser
+
+
+@pytest.fixture
+def parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--lr", type=float, searchable=True)
+    parser.add_argument("--warmup", type=int, searchable=True)
+    parser.add_argument("--bs", type=int, searchable=True, default=4)
+    parser.add_argument("--seed", type=int, searchable=True)
+    parser.add_argument("--layers", type=int, nargs="+", searchable=True)
+    parser.add_argument("--dataset", type=str)
+    return parser
+
+
+@pytest.fixture
+def config(tmp_path):
+    def write(content):
+        path = tmp_path / f"config{len(list(tmp_path.iterdir()))}.yml"
+        path.write_text(content)
+        return str(path)
+
+    return write
+
+
+GRID_CONFIG = """
+lr: [0.1, 0.01]
+seed: 3
+layers: [[64, 64], [128]]
+dataset: top
+_subspaces_:
+  - {dataset: cifar, bs: [16, 32]}
+  - dataset: mnist
+    _subspaces_:
+      - {bs: 8}
+      - {bs: 9, lr: 0.5}
+"""
+
+
+def values(namespaces):
+    return [(ns.dataset, ns.lr, ns.bs, tuple(ns.layers)) for ns in namespaces]
+
+
+def test_lists_and_subspaces(parser, config):
+    namespaces = parser.parse_args(["--gridparse-config", config(GRID_CONFIG)])
+    assert values(namespaces) == [
+        ("cifar", 0.1, 16, (64, 64)),
+        ("cifar", 0.01, 16, (64, 64)),
+        ("cifar", 0.1, 32, (64, 64)),
+        ("cifar", 0.01, 32, (64, 64)),
+        ("cifar", 0.1, 16, (128,)),
+        ("cifar", 0.01, 16, (128,)),
+        ("cifar", 0.1, 32, (128,)),
+        ("cifar", 0.01, 32, (128,)),
+        ("mnist", 0.1, 8, (64, 64)),
+        ("mnist", 0.01, 8, (64, 64)),
+        ("mnist", 0.1, 8, (128,)),
+        ("mnist", 0.01, 8, (128,)),
+        ("mnist", 0.5, 9, (64, 64)),
+        ("mnist", 0.5, 9, (128,)),
+    ]
+    assert all(ns.seed == 3 and ns.warmup is None for ns in namespaces)
+
+
+def test_command_line_takes_priority(parser, config):
+    argv = ["--gridparse-config", config(GRID_CONFIG)]
+    argv += ["--lr", "1", "--dataset", "cli"]
+    namespaces = parser.parse_args(argv)
+    assert len(namespaces) == 8
+    assert all(ns.lr == 1.0 and ns.dataset == "cli" for ns in namespaces)
+    assert sorted(set(ns.bs for ns in namespaces)) == [8, 9, 16, 32]
+
+
+def test_zipped_and_list_values(parser, config):
+    parser.add_zip_group("lr", "warmup")
+    path = config("lr: [0.1, 0.2]\nwarmup: [1, 2]\nlayers: [1, 2]\n")
+    namespaces = parser.parse_args(["--gridparse-config", path])
+    assert [(ns.lr, ns.warmup, ns.layers) for ns in namespaces] == [
+        (0.1, 1, [1, 2]),
+        (0.2, 2, [1, 2]),
+    ]
+
+
+def test_scalars_and_command_line_subspaces(parser, config):
+    grid_path, scalar_path = config(GRID_CONFIG), config("seed: 5\n")
+    namespaces = parser.parse_args(["--gridparse-config", scalar_path])
+    assert [vars(ns) for ns in namespaces] == [
+        dict(dataset=None, lr=None, warmup=None, bs=4, seed=5, layers=None)
+    ]
+    grid = parser.parse_grid(
+        ["{", "--gridparse-config", grid_path, "}"]
+        + ["{", "--gridparse-config", scalar_path, "--seed", "1", "2", "}"]
+    )
+    assert len(grid) == 14 + 2
+    assert [ns.seed for ns in grid[14:]] == [1, 2]
+
+
+def test_single_values(parser, config):
+    # one-element lists mean the same as longer ones
+    path = config("lr: [0.1]\nlayers: [[1, 2]]\nseed: 3\n")
+    namespaces = parser.parse_args(["--gridparse-config", path])
+    assert [(ns.lr, ns.layers, ns.seed) for ns in namespaces] == [
+        (0.1, [1, 2], 3)
+    ]
+
+
+def test_invalid_subspaces(parser, config):
+    with pytest.raises(SystemExit):
+        parser.parse_args(
+            ["--gridparse-config", config("_subspaces_: {a: 1}\n")]
+        )
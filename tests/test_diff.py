@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from gridparse import GridArgumentParser, GridDiff, save_manifest
+
+
+@pytest.fixture
+def parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--a", type=int, searchable=True)
+    parser.add_argument("--b", type=int, searchable=True, default=0)
+    parser.add_argument("--c", type=int, nargs="+", searchable=True)
+    parser.add_argument("--n", type=str, default="x")
+    return parser
+
+
+def key(namespace):
+    return repr(sorted((k, repr(v)) for k, v in vars(namespace).items()))
+
+
+def brute_force(parser, old_args, new_args):
+    old = [key(ns) for ns in parser.parse_args(old_args)]
+    new = [key(ns) for ns in parser.parse_args(new_args)]
+    added = [i for i, k in enumerate(new) if k not in set(old)]
+    removed = [i for i, k in enumerate(old) if k not in set(new)]
+    return added, removed
+
+
+def random_args(rng):
+    args = ["--a"] + [str(rng.randrange(6)) for _ in range(rng.randrange(1, 4))]
+    if rng.random() < 0.6:
+        args += ["--b"] + [
+            str(rng.randrange(4)) for _ in range(rng.randrange(1, 3))
+        ]
+    if rng.random() < 0.5:
+        args += ["--c"] + [
+            f"{rng.randrange(3)}|{rng.randrange(2)}"
+            for _ in range(rng.randrange(1, 3))
+        ]
+    if rng.random() < 0.4:
+        args += ["{", "--n", rng.choice("xy"), "}"]
+        args += ["{", "--n", "z", "--b", "7", "}"]
+    if rng.random() < 0.5:
+        # repeated subspaces with the same key
+        for _ in range(rng.randrange(1, 4)):
+            args += ["{", "--b"]
+            args += [str(rng.randrange(4)) for _ in range(rng.randrange(1, 3))]
+            args += ["}"]
+    return args
+
+
+def test_against_brute_force(parser):
+    rng = random.Random(0)
+    for _ in range(200):
+        old_args, new_args = random_args(rng), random_args(rng)
+        diff = parser.diff_grid(old_args, new_args)
+        added, removed = brute_force(parser, old_args, new_args)
+
+        assert sorted(diff.added_indices()) == added, (old_args, new_args)
+        assert sorted(diff.removed_indices()) == removed, (old_args, new_args)
+        assert diff.num_added() == len(added)
+        assert diff.num_removed() == len(removed)
+        assert [key(ns) for ns in diff.added()] == [
+            key(diff.new[i]) for i in diff.added_indices()
+        ]
+
+
+def test_repeated_subspaces(parser):
+    diff = parser.diff_grid(
+        "--a 1 2 3".split(), "{ --a 1 } { --a 2 } { --a 4 }".split()
+    )
+    assert [ns.a for ns in diff.added()] == [4]
+    assert [ns.a for ns in diff.removed()] == [3]
+    assert diff.num_added() == diff.num_removed() == 1
+
+
+def test_manifest(parser, tmp_path):
+    path = str(tmp_path / "manifest.json")
+    save_manifest(path, "--a range:0:1000 --b range:0:1000".split())
+    diff = parser.diff_grid(path, "--a range:0:1001 --b range:0:1000".split())
+
+    assert isinstance(diff, GridDiff)
+    assert diff.num_added() == 1000
+    assert diff.num_removed() == 0
+    assert [(ns.a, ns.b) for ns in list(diff.added())[:2]] == [
+        (1000, 0),
+        (1000, 1),
+    ]
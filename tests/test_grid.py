@@ -0,0 +1,223 @@
+import json
+
+import pytest
+
+from gridparse import Grid, GridArgumentParser, GridSearchSession
+
+
+@pytest.fixture
+def parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--a", type=int, searchable=True)
+    parser.add_argument("--b", type=int, searchable=True, default=0)
+    parser.add_argument("--c", type=str, searchable=True, default="args.a")
+    parser.add_argument("--name", type=str)
+    return parser
+
+
+# namespaces (and their order) produced by the eager expansion of 1.5.5
+BASELINE = [
+    (
+        "--a 1 2 { --b 1 2 --name x } { --b 3 --name y }",
+        [
+            dict(name="x", a=1, b=1, c=1),
+            dict(name="x", a=2, b=1, c=2),
+            dict(name="x", a=1, b=2, c=1),
+            dict(name="x", a=2, b=2, c=2),
+            dict(name="y", a=1, b=3, c=1),
+            dict(name="y", a=2, b=3, c=2),
+        ],
+    ),
+    (
+        "--a 1 2 --b 3 4 --c z args.b",
+        [
+            dict(name=None, a=1, b=3, c="z"),
+            dict(name=None, a=2, b=3, c="z"),
+            dict(name=None, a=1, b=4, c="z"),
+            dict(name=None, a=2, b=4, c="z"),
+            dict(name=None, a=1, b=3, c=3),
+            dict(name=None, a=2, b=3, c=3),
+            dict(name=None, a=1, b=4, c=4),
+            dict(name=None, a=2, b=4, c=4),
+        ],
+    ),
+    (
+        "--a 1 2 { --b 5 { --name x } { --name y --c w } } { --b 6 }",
+        [
+            dict(name="x", a=1, b=5, c=1),
+            dict(name="x", a=2, b=5, c=2),
+            dict(name="y", a=1, b=5, c="w"),
+            dict(name="y", a=2, b=5, c="w"),
+            dict(name=None, a=1, b=6, c=1),
+            dict(name=None, a=2, b=6, c=2),
+        ],
+    ),
+]
+
+
+@pytest.mark.parametrize("argv,expected", BASELINE)
+def test_parse_args_baseline_order(parser, argv, expected):
+    assert [vars(ns) for ns in parser.parse_args(argv.split())] == expected
+
+
+@pytest.mark.parametrize("argv,expected", BASELINE)
+def test_grid_matches_parse_args(parser, argv, expected):
+    grid = parser.parse_grid(argv.split())
+    assert isinstance(grid, Grid)
+    assert len(grid) == len(expected)
+    assert [vars(grid[i]) for i in range(len(grid))] == expected
+    assert [vars(ns) for ns in grid[::-2]] == expected[::-2]
+    assert vars(grid[-1]) == expected[-1]
+    with pytest.raises(IndexError):
+        grid[len(expected)]
+
+
+def test_subparsers_baseline_order():
+    parser = GridArgumentParser()
+    parser.add_argument("--seed", type=int, searchable=True)
+    subparsers = parser.add_subparsers(dest="cmd")
+    train = subparsers.add_parser("train")
+    train.add_argument("--lr", type=float, searchable=True)
+
+    argv = "train --lr 0.1 0.2".split()
+    expected = [
+        dict(seed=None, cmd="train", lr=0.1),
+        dict(seed=None, cmd="train", lr=0.2),
+    ]
+    assert [vars(ns) for ns in parser.parse_args(argv)] == expected
+    assert [vars(ns) for ns in parser.parse_grid(argv)] == expected
+
+
+def test_grid_namespaces_are_independent(parser):
+    grid = parser.parse_grid("--a 1 2".split())
+    grid[0].a = 10
+    assert grid[0].a == 1
+
+
+@pytest.fixture
+def search_parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--lr", type=float, searchable=True)
+    parser.add_argument("--bs", type=int, searchable=True)
+    parser.add_argument("--epochs", type=int, default=1)
+    return parser
+
+
+SEARCH_ARGV = "--lr 1 2 3 4 5 6 7 8 9 --bs 1 2 3 4 5 6 7 8 9 10".split()
+
+
+def run_session(session):
+    asked = 0
+    while not session.finished:
+        trial = session.ask()
+        assert trial is not None
+        assert trial.namespace.epochs == trial.resource
+        asked += 1
+        session.tell(trial.id, trial.namespace.lr * trial.namespace.bs)
+    return asked
+
+
+def test_hyperband(search_parser):
+    session = GridSearchSession(
+        search_parser,
+        SEARCH_ARGV,
+        max_resource=27,
+        eta=3,
+        resource_arg="epochs",
+        seed=0,
+    )
+    # brackets of 27, 12, 6 and 4 configurations, promoting a third
+    assert [b["rungs"][0]["size"] for b in session.brackets] == [27, 12, 6, 4]
+    assert run_session(session) == 27 + 9 + 3 + 1 + 12 + 4 + 1 + 6 + 2 + 4
+    assert session.ask() is None
+
+    trial, score = session.best()
+    assert trial.resource == 27
+    assert score == max(
+        t.namespace.lr * t.namespace.bs
+        for t in map(session._trial, session.trials)
+        if t.resource == 27
+    )
+
+
+def test_successive_halving_waits_for_rung(search_parser):
+    session = GridSearchSession(
+        search_parser,
+        SEARCH_ARGV,
+        max_resource=9,
+        method="successive_halving",
+        n_configs=9,
+        mode="min",
+        seed=1,
+    )
+    trials = [session.ask() for _ in range(9)]
+    assert session.ask() is None
+    for trial in trials:
+        session.tell(trial, trial.namespace.lr)
+    promoted = [session.ask() for _ in range(3)]
+    assert [t.rung for t in promoted] == [1, 1, 1]
+    lrs = sorted(t.namespace.lr for t in trials)[:3]
+    assert sorted(t.namespace.lr for t in promoted) == lrs
+
+    with pytest.raises(ValueError):
+        session.tell(trials[0], 0.0)
+
+
+def test_n_configs_rejected_with_hyperband(search_parser):
+    with pytest.raises(ValueError):
+        GridSearchSession(search_parser, SEARCH_ARGV, n_configs=5)
+
+
+def test_session_resumes(search_parser, tmp_path):
+    path = str(tmp_path / "session.json")
+    session = GridSearchSession(
+        search_parser,
+        SEARCH_ARGV,
+        max_resource=9,
+        resource_arg="epochs",
+        seed=0,
+        state_path=path,
+    )
+    for _ in range(5):
+        trial = session.ask()
+        session.tell(trial.id, trial.namespace.lr)
+    running = session.ask()
+
+    resumed = GridSearchSession.load(search_parser, path)
+    assert resumed.trials.keys() == session.trials.keys()
+    assert resumed.trials[running.id]["status"] == "pending"
+    trial = resumed.ask()
+    assert trial.id == running.id
+    resumed.tell(trial, trial.namespace.lr)
+    run_session(resumed)
+    assert resumed.finished
+
+
+def test_session_refuses_changed_grid(search_parser, tmp_path):
+    path = str(tmp_path / "session.json")
+    GridSearchSession(
+        search_parser, SEARCH_ARGV, max_resource=9, state_path=path
+    )
+    with open(path) as fp:
+        state = json.load(fp)
+    state["args"] += ["--bs", "1"]
+    with open(path, "w") as fp:
+        json.dump(state, fp)
+    with pytest.raises(ValueError):
+        GridSearchSession.load(search_parser, path)
+
+
+def test_resource_has_the_type_of_the_argument(search_parser):
+    session = GridSearchSession(
+        search_parser, SEARCH_ARGV, max_resource=9, resource_arg="epochs"
+    )
+    trial = session.ask()
+    assert trial.namespace.epochs == 1 and type(trial.namespace.epochs) is int
+    argv = search_parser.to_argv(trial.namespace)
+    assert vars(search_parser.parse_args(argv)[0]) == vars(trial.namespace)
+
+    with pytest.raises(ValueError):
+        # rungs of 10 / 9 and 10 / 3 epochs
+        GridSearchSession(
+            search_parser, SEARCH_ARGV, max_resource=10, resource_arg="epochs"
+        )
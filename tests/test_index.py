@@ -0,0 +1,120 @@
+import argparse
+import random
+
+import pytest
+
+from gridparse import GridArgumentParser, GridIndex
+from gridparse.utils import _freeze
+
+
+@pytest.fixture
+def parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--lr", type=float, searchable=True)
+    parser.add_argument("--warmup", type=int, searchable=True)
+    parser.add_argument("--bs", type=int, searchable=True, default=4)
+    parser.add_argument("--seed", type=int, searchable=True)
+    parser.add_argument("--layers", type=int, nargs="+", searchable=True)
+    parser.add_argument("--dataset", type=str)
+    parser.add_argument("--other", type=str, default="args.seed")
+    parser.add_zip_group("lr", "warmup")
+    return parser
+
+
+def matches(namespace, conditions):
+    for attr, condition in conditions.items():
+        if not hasattr(namespace, attr):
+            return False
+        value = _freeze(getattr(namespace, attr))
+        if isinstance(condition, set):
+            if value not in set(_freeze(c) for c in condition):
+                return False
+        elif value != _freeze(condition):
+            return False
+    return True
+
+
+def random_conditions(rng, namespaces):
+    attrs = sorted(vars(namespaces[0]))
+    conditions = {}
+    for attr in rng.sample(attrs, rng.randint(0, 3)):
+        values = [getattr(ns, attr) for ns in namespaces]
+        if rng.random() < 0.5 or any(isinstance(v, list) for v in values):
+            conditions[attr] = rng.choice(values)
+        else:
+            conditions[attr] = set(rng.sample(values, 2)) | {-1}
+    return conditions
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        "--seed 1 2 3 4 --bs 1 2 --lr 0.1 0.2",
+        "--lr 0.1 0.2 0.3 --warmup 1 2 3 --seed 1 2 3 "
+        "{ --dataset x --bs 1 2 } { --dataset y --layers 1|2 3 }",
+        "--seed 1 2 --bs args.seed 7 --lr 0.1 0.2",
+        "--seed 1 2 --lr 0.1 0.2 --warmup args.seed 5",
+        "--seed 1 2 { --bs args.seed 3 } { --dataset z }",
+    ],
+)
+def test_against_linear_scan(parser, argv):
+    rng = random.Random(0)
+    grid = parser.parse_grid(argv.split())
+    namespaces = list(grid)
+    grid_index, list_index = GridIndex(grid), GridIndex(namespaces)
+    assert len(grid_index) == len(list_index) == len(namespaces)
+
+    for _ in range(100):
+        conditions = random_conditions(rng, namespaces)
+        expected = [
+            i for i, ns in enumerate(namespaces) if matches(ns, conditions)
+        ]
+        assert grid_index.where(**conditions) == expected, conditions
+        assert list_index.where(**conditions) == expected, conditions
+        assert grid_index.count(**conditions) == len(expected)
+        assert list_index.count(**conditions) == len(expected)
+
+        attrs = rng.sample(sorted(vars(namespaces[0])), rng.randint(1, 3))
+        groups = grid_index.group_by(*attrs)
+        assert groups == list_index.group_by(*attrs)
+        assert sorted(i for g in groups.values() for i in g) == list(
+            range(len(namespaces))
+        )
+
+
+def test_values_borrowed_from_other_axes():
+    parser = GridArgumentParser()
+    parser.add_argument("--a", type=int, searchable=True)
+    parser.add_argument("--b", type=int, searchable=True)
+    index = GridIndex(parser.parse_grid("--a 1 2 --b args.a 7".split()))
+
+    assert index.where(b=2) == [1]
+    assert index.count(b={1, 2}) == 2
+    assert index.group_by("b") == {1: [0], 2: [1], 7: [2, 3]}
+
+
+def test_queries():
+    parser = GridArgumentParser()
+    parser.add_argument("--num", type=int, searchable=True)
+    parser.add_argument("--text", type=str, searchable=True)
+    grid = parser.parse_grid("--num 1 2 3 --text a b".split())
+    index = GridIndex(grid)
+
+    assert index.where(num={1, 3}, text="b") == [3, 5]
+    assert index.where(num=True) == []
+    assert index.where(nope=1) == []
+    assert index.count(text="a") == 3
+    assert index.group_by("text") == {"a": [0, 1, 2], "b": [3, 4, 5]}
+    assert [vars(ns) for ns in index.select(num=2)] == [
+        dict(num=2, text="a"),
+        dict(num=2, text="b"),
+    ]
+
+
+def test_values_of_different_types():
+    namespaces = [argparse.Namespace(x=x) for x in (1, 1.0, True, 2)]
+    index = GridIndex(namespaces)
+    assert index.where(x=1) == [0]
+    assert index.where(x={True, 2}) == [2, 3]
+    # equal keys of the result, so their groups are merged
+    assert index.group_by("x") == {1: [0, 1, 2], 2: [3]}
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import sys
+import time
+
+import pytest
+
+from gridparse import GridArgumentParser, format_command, launch_grid
+
+
+def collect(*args, **kwargs):
+    async def main():
+        return [event async for event in launch_grid(*args, **kwargs)]
+
+    return asyncio.run(main())
+
+
+@pytest.fixture
+def parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--code", type=int, searchable=True, default=0)
+    parser.add_argument("--name", type=str, default="run")
+    return parser
+
+
+def test_format_command():
+    namespace = argparse.Namespace(lr=0.1, name="a b")
+    command = format_command("train --lr {lr} --i {index}", namespace, index=3)
+    assert command == ["train", "--lr", "0.1", "--i", "3"]
+    assert format_command(["echo", "{name}"], namespace) == ["echo", "a b"]
+    assert format_command(
+        "run {argv} x{argv}", namespace, argv=["--name", "a b"]
+    ) == ["run", "--name", "a b", "x--name 'a b'"]
+    assert format_command(
+        lambda ns, index: ["echo", str(index)], namespace, index=1
+    ) == ["echo", "1"]
+
+
+def test_launch(parser):
+    grid = parser.parse_grid("--code 0 1 2 3".split())
+    template = [sys.executable, "-c", "import sys; sys.exit({code})"]
+    events = collect(grid, template, concurrency=2)
+
+    assert sorted(e.index for e in events) == [0, 1, 2, 3]
+    assert all(e.returncode == e.namespace.code for e in events)
+    assert all(e.error is None and e.slot in (0, 1) for e in events)
+
+
+def test_indices_and_argv(parser):
+    grid = parser.parse_grid("--code 0 1 2 3 --name x".split())
+    template = [sys.executable, "-c", "import sys; sys.exit(len(sys.argv))"]
+    events = collect(grid, template + ["{argv}"], indices=[1, 3], parser=parser)
+
+    assert sorted(e.index for e in events) == [1, 3]
+    # `--code N --name x` after the script name
+    assert all(e.returncode == 5 for e in events)
+    assert all(e.argv[-2:] == ["--name", "x"] for e in events)
+
+
+def test_command_errors_are_reported(parser):
+    grid = parser.parse_grid("--code 0 1 2".split())
+    events = collect(grid, "echo {nope}", concurrency=2)
+
+    assert sorted(e.index for e in events) == [0, 1, 2]
+    assert all(e.returncode is None and "nope" in e.error for e in events)
+
+
+def test_argv_within_token(parser):
+    grid = parser.parse_grid("--code 0 1 --name x".split())
+    template = [sys.executable, "-c", "import sys; sys.exit({code})", "x{argv}"]
+    events = collect(grid, template, concurrency=2, parser=parser)
+
+    assert sorted(e.returncode for e in events) == [0, 1]
+    assert events[0].argv[-1].startswith("x--")
+
+
+def test_missing_executable():
+    events = collect([argparse.Namespace()], "/nonexistent/command")
+    assert events[0].returncode is None
+    assert events[0].error is not None
+
+
+def test_closing_kills_commands():
+    configs = [argparse.Namespace(t=t) for t in (0, 30, 30)]
+    template = [sys.executable, "-c", "import time; time.sleep({t})"]
+
+    async def main():
+        events = launch_grid(configs, template, concurrency=3)
+        async for event in events:
+            break
+        started = time.time()
+        await events.aclose()
+        return event, time.time() - started
+
+    event, closing = asyncio.run(main())
+    assert event.index == 0 and event.returncode == 0
+    assert closing < 10
+
+
+def test_aiter_grid(parser):
+    async def main():
+        return [ns.code async for ns in parser.aiter_grid(["--code", "1", "2"])]
+
+    assert asyncio.run(main()) == [1, 2]
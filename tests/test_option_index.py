@@ -0,0 +1,97 @@
+import argparse
+import copy
+
+import pytest
+
+from gridparse import GridArgumentParser
+from gridparse.grid_argument_parser import AuxArgumentParser, _OptionIndex
+
+
+def build(cls, **kwargs):
+    parser = cls(**kwargs)
+    parser.add_argument("-x", action="store_true")
+    parser.add_argument("-y", action="store_true")
+    parser.add_argument("-z", type=int)
+    parser.add_argument("-zap", type=int)
+    parser.add_argument("--foo")
+    parser.add_argument("--foobar")
+    parser.add_argument("--baz", type=int)
+    parser.add_argument("--qux-long")
+    group = parser.add_argument_group("group")
+    group.add_argument("--grouped")
+    return parser
+
+
+def parse(parser, argv, capsys):
+    try:
+        namespace, extras = parser.parse_known_args(argv.split())
+    except SystemExit:
+        return "error", capsys.readouterr().err.splitlines()[-1]
+    attrs = vars(namespace)
+    attrs.pop("___specified_args___", None)
+    return attrs, extras
+
+
+@pytest.mark.parametrize("allow_abbrev", [True, False])
+@pytest.mark.parametrize(
+    "argv",
+    [
+        "-xy",
+        "-z3",
+        "-zap 4",
+        "-za 4",
+        "--fo a",
+        "--foo a",
+        "--foob b",
+        "--ba 3",
+        "--baz=4",
+        "--b=4",
+        "--qux x",
+        "--gro a",
+        "-xz5",
+        "--nope",
+        "-q",
+        "--foo=",
+        "-z=3",
+    ],
+)
+def test_same_matches_as_argparse(argv, allow_abbrev, capsys):
+    expected = parse(
+        build(argparse.ArgumentParser, allow_abbrev=allow_abbrev),
+        argv,
+        capsys,
+    )
+    result = parse(
+        build(AuxArgumentParser, allow_abbrev=allow_abbrev), argv, capsys
+    )
+    assert result == expected
+
+
+def test_startswith():
+    index = _OptionIndex()
+    for key in ["--foobar", "--baz", "--foo", "-f", "--fo"]:
+        index[key] = None
+    assert index.startswith("--fo") == ["--foobar", "--foo", "--fo"]
+    assert index.startswith("--q") == []
+
+    del index["--foo"]
+    assert index.pop("--fo") is None
+    assert index.startswith("--fo") == ["--foobar"]
+    assert index._keys == sorted(index)
+
+
+def test_resolved_conflicts_and_copies():
+    parser = GridArgumentParser(conflict_handler="resolve")
+    parser.add_argument("--aa")
+    parser.add_argument("-a", "--aa2")
+    parser.add_argument("--aa")
+
+    copied = copy.deepcopy(parser)
+    index = copied._option_string_actions
+    assert isinstance(index, _OptionIndex)
+    assert index._keys == sorted(index)
+    assert index is copied._optionals._option_string_actions
+
+    assert vars(copied.parse_args(["--aa2", "1", "--aa", "2"])[0]) == dict(
+        aa="2", aa2="1"
+    )
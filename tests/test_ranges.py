@@ -0,0 +1,101 @@
+import pytest
+
+from gridparse import GridArgumentParser, IntRange, LinearRange, LogRange
+from gridparse.ranges import ValueChain, ValueRange
+
+
+@pytest.fixture
+def parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--lr", type=float, searchable=True)
+    parser.add_argument("--n", type=int, searchable=True)
+    parser.add_argument("--c", type=int, searchable=True, choices=[1, 2, 3])
+    parser.add_argument("--s", type=str, searchable=True)
+    parser.add_argument("--u", searchable=True)
+    return parser
+
+
+def test_ranges():
+    assert list(LinearRange(0, 1, 5)) == [0, 0.25, 0.5, 0.75, 1]
+    assert list(LogRange(1e-3, 1e-1, 3)) == pytest.approx([1e-3, 1e-2, 1e-1])
+    assert list(IntRange(0, 10, 3)) == [0, 3, 6, 9]
+    assert list(IntRange(0, 3, type=float)) == [0.0, 1.0, 2.0]
+    assert LinearRange(0, 1, 5)[-1] == 1
+    assert LinearRange(0, 1, 5)[1:3] == [0.25, 0.5]
+    with pytest.raises(IndexError):
+        LinearRange(0, 1, 5)[5]
+    with pytest.raises(ValueError):
+        LogRange(0, 1, 3)
+
+    chain = ValueChain([0.5, IntRange(0, 3), None])
+    assert len(chain) == 5
+    assert list(chain) == [0.5, 0, 1, 2, None]
+
+
+def test_lazy_grid(parser):
+    grid = parser.parse_grid(
+        "--lr log:1e-4:1e-1:4 0.5 _None_ --n range:0:100000".split()
+    )
+    assert len(grid) == 6 * 100000
+    assert vars(grid[0]) == dict(lr=1e-4, n=0, c=None, s=None, u=None)
+    assert vars(grid[-1]) == dict(lr=None, n=99999, c=None, s=None, u=None)
+    assert grid[6 * 1234 + 4].n == 1234
+    assert grid[6 * 1234 + 4].lr == 0.5
+
+
+def test_same_as_values(parser):
+    ranges = parser.parse_args("--n range:0:6:2 --lr lin:0:1:3".split())
+    values = parser.parse_args("--n 0 2 4 --lr 0 0.5 1".split())
+    assert [vars(ns) for ns in ranges] == [vars(ns) for ns in values]
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        "--c range:1:5",
+        "--n lin:1:2",
+        "--lr log:0:1:3",
+        "--n range:3:1",
+        "--n lin:0:1:3",
+        "--n log:1:10:3",
+    ],
+)
+def test_invalid_ranges(parser, argv):
+    with pytest.raises(SystemExit):
+        parser.parse_args(argv.split())
+
+
+def test_integer_lin_and_log_ranges(parser):
+    namespaces = parser.parse_args("--n lin:0:10:3 log:1:100:3".split())
+    assert [ns.n for ns in namespaces] == [0, 5, 10, 1, 10, 100]
+    with pytest.raises(TypeError):
+        ValueRange(3)
+
+
+def test_non_numeric_types_keep_strings(parser):
+    namespaces = parser.parse_args("--s lin:0:1:3 --u range:0:2".split())
+    assert [(ns.s, ns.u) for ns in namespaces] == [("lin:0:1:3", "range:0:2")]
+
+
+def test_opt_in_types():
+    def even(value):
+        value = int(value)
+        if value % 2:
+            raise ValueError
+        return value
+
+    even.accepts_ranges = True
+
+    parser = GridArgumentParser()
+    parser.add_argument("--x", type=even, searchable=True)
+    assert [ns.x for ns in parser.parse_args(["--x", "range:0:5:2"])] == [
+        0,
+        2,
+        4,
+    ]
+
+
+def test_range_defaults():
+    parser = GridArgumentParser()
+    parser.add_argument("--x", type=int, searchable=True, default="range:0:3")
+    assert [ns.x for ns in parser.parse_args([])] == [0, 1, 2]
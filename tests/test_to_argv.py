@@ -0,0 +1,122 @@
+import argparse
+
+import pytest
+
+from gridparse import GridArgumentParser, list_as_delim_str
+
+
+def check_round_trip(parser, argv):
+    namespaces = parser.parse_args(argv.split())
+    all_argv = parser.to_argv_many(namespaces)
+    for namespace, args in zip(namespaces, all_argv):
+        assert parser.to_argv(namespace) == args
+        back = parser.parse_args(args)
+        assert len(back) == 1
+        assert vars(back[0]) == vars(namespace)
+    return all_argv
+
+
+def test_round_trip():
+    parser = GridArgumentParser()
+    parser.add_argument("pos", type=int)
+    parser.add_argument("--hparam1", type=int, searchable=True)
+    parser.add_argument("--hparam2", nargs="+", type=int, searchable=True)
+    parser.add_argument("--normal", required=True, type=str)
+    parser.add_argument("--flag", type=bool, searchable=True)
+    parser.add_argument(
+        "--lists",
+        required=True,
+        nargs="+",
+        type=list_as_delim_str(int),
+        searchable=True,
+    )
+    parser.add_argument(
+        "--normal_lists", nargs="+", type=list_as_delim_str(str)
+    )
+    parser.add_argument(
+        "--other-num", type=int, splits=["train", "test"], searchable=True
+    )
+    parser.add_argument(
+        "--o", type=int, searchable=True, default="args.hparam1"
+    )
+    parser.add_argument("--t", type=str, searchable=True)
+    parser.add_argument("--f", type=float, searchable=True, default=0.5)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument("--c", action="count")
+    parser.add_argument("--ap", action="append", type=int)
+    parser.add_argument("--neg", type=float)
+    parser.add_argument("--opt", nargs="?", const="C", default="D")
+
+    all_argv = check_round_trip(
+        parser,
+        "3 --hparam1 1 2 3 --hparam2 4|3 5|4 --flag true false --t a _None_ "
+        "--normal n --lists 1,-2,3 3,4,5|6,7 --train-other-num 1 2 "
+        "--test-other 3 --o 5 args.hparam1 --normal_lists a,b,c d,e,f "
+        "-v --c --c --ap 1 --ap 2 --neg -3 --f 0.5 lin:0:1:3 --opt",
+    )
+    assert len(all_argv) == 3 * 2 * 2 * 2 * 2 * 2 * 2 * 4
+    # defaults are left out
+    assert "--f" not in all_argv[0]
+    assert "--o" not in all_argv[-1]
+
+
+def test_minimal():
+    parser = GridArgumentParser()
+    parser.add_argument("--num", type=int, searchable=True, default=1)
+    parser.add_argument("--text", type=str, searchable=True, default="a")
+    namespaces = parser.parse_args("--num 1 2 --text a _None_".split())
+    assert parser.to_argv_many(namespaces) == [
+        [],
+        ["--num", "2"],
+        ["--text", "_None_"],
+        ["--num", "2", "--text", "_None_"],
+    ]
+
+    # the string "_None_" would be parsed back as `None`
+    for text in ("_None_", "{a", "a}", "args.num"):
+        with pytest.raises(ValueError):
+            parser.to_argv(argparse.Namespace(num=1, text=text))
+
+
+def test_subparsers():
+    parser = GridArgumentParser()
+    parser.add_argument("--top", type=int, default=1)
+    subparsers = parser.add_subparsers(dest="cmd")
+    sub = subparsers.add_parser("a")
+    sub.add_argument("--x", type=int, searchable=True)
+    assert check_round_trip(parser, "--top 2 a --x 1 2") == [
+        ["--top", "2", "a", "--x", "1"],
+        ["--top", "2", "a", "--x", "2"],
+    ]
+
+
+def test_values_like_options():
+    parser = GridArgumentParser()
+    parser.add_argument("--t", type=str, searchable=True)
+    parser.add_argument("--l", nargs="+")
+
+    namespace = argparse.Namespace(t="-x", l=["a", "-1"])
+    assert parser.to_argv(namespace) == ["--t=-x", "--l", "a", "-1"]
+    assert vars(parser.parse_args(parser.to_argv(namespace))[0]) == vars(
+        namespace
+    )
+
+    with pytest.raises(ValueError):
+        parser.to_argv(argparse.Namespace(t=None, l=["a", "-b"]))
+
+
+def test_defaults_are_converted_lazily(tmp_path):
+    path = tmp_path / "out.txt"
+    parser = GridArgumentParser()
+    parser.add_argument("--out", type=argparse.FileType("w"), default=str(path))
+    parser.add_argument("--n", type=int, default="1")
+    parser.add_argument("--mode", type=int, required=True, default="auto")
+
+    other = tmp_path / "other.txt"
+    with open(other, "w") as fp:
+        namespace = argparse.Namespace(out=fp, n=1, mode=3)
+        assert parser.to_argv(namespace) == ["--out", str(other), "--mode", "3"]
+        namespace = argparse.Namespace(out=fp, n=2, mode=3)
+        assert parser.to_argv(namespace)[2:4] == ["--n", "2"]
+    # the default file is never created
+    assert not path.exists()
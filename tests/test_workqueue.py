@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gridparse import FileWorkQueue, GridArgumentParser
+
+
+def make_queue(directory, size, **kwargs):
+    kwargs.setdefault("heartbeat_interval", 100)
+    return FileWorkQueue(str(directory), list(range(size)), **kwargs)
+
+
+def test_workers_share_the_grid(tmp_path):
+    parser = GridArgumentParser()
+    parser.add_argument("--x", type=int, searchable=True)
+    grid = parser.parse_grid(["--x", *map(str, range(50))])
+    claimed = []
+
+    def work():
+        with FileWorkQueue(str(tmp_path), grid, lease_timeout=5) as queue:
+            for i, namespace in queue.items():
+                assert namespace.x == i
+                claimed.append(i)
+                queue.complete(i, i % 2)
+
+    workers = [threading.Thread(target=work) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sorted(claimed) == list(range(50))
+    queue = FileWorkQueue(str(tmp_path), grid)
+    assert queue.finished
+    assert queue.claim() is None
+    assert queue.returncodes() == {i: i % 2 for i in range(50)}
+
+
+def test_different_grid(tmp_path):
+    make_queue(tmp_path, 3, argv=["--x", "0", "1", "2"])
+    with pytest.raises(ValueError):
+        make_queue(tmp_path, 4)
+    with pytest.raises(ValueError):
+        make_queue(tmp_path, 3, argv=["--x", "1", "2", "3"])
+    make_queue(tmp_path, 3, argv=["--x", "0", "1", "2"])
+
+
+def test_stale_leases_are_reclaimed(tmp_path):
+    a = make_queue(tmp_path, 3, lease_timeout=0.2, worker_id="a")
+    b = make_queue(tmp_path, 3, lease_timeout=0.2, worker_id="b")
+    assert [a.claim() for _ in range(4)] == [0, 1, 2, None]
+    assert b.claim() is None
+
+    time.sleep(0.3)
+    assert b.claim() == 0
+    a.heartbeat()
+    assert a.lost == {0}
+
+    # releasing a reclaimed configuration keeps the new lease
+    a.release(0)
+    assert (tmp_path / "leases" / "0").exists()
+
+    a.complete(1)
+    b.release(0)
+    time.sleep(0.3)
+    assert b.claim() == 0
+    assert b.claim() == 2
+    assert b.done_indices() == {1}
+
+
+def test_heartbeats_keep_leases(tmp_path):
+    a = make_queue(tmp_path, 2, lease_timeout=0.3, heartbeat_interval=0.05)
+    b = make_queue(tmp_path, 2, lease_timeout=0.3)
+    with a, b:
+        assert a.claim() == 0
+        time.sleep(0.6)
+        assert b.claim() == 1
+        assert b.claim() is None
+
+
+def test_concurrent_reclaims(tmp_path):
+    for trial in range(10):
+        directory = tmp_path / str(trial)
+        make_queue(directory, 1, lease_timeout=0.1, worker_id="dead").claim()
+        time.sleep(0.2)
+
+        queues = [
+            make_queue(directory, 1, lease_timeout=0.1, worker_id=str(k))
+            for k in range(8)
+        ]
+        barrier = threading.Barrier(len(queues))
+        claimed = []
+
+        def reclaim(queue):
+            barrier.wait()
+            if queue.claim() is not None:
+                claimed.append(queue.worker_id)
+
+        threads = [threading.Thread(target=reclaim, args=(q,)) for q in queues]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(claimed) == 1
+
+
+def test_wait_for_other_workers(tmp_path):
+    a = make_queue(tmp_path, 2, lease_timeout=0.2)
+    b = make_queue(tmp_path, 2, lease_timeout=0.2)
+    assert a.claim() == 0 and a.claim() == 1
+    a.complete(0)
+
+    # b waits until a's lease of 1 is stale, and then finishes it
+    claims = b.claims(wait=True, poll_interval=0.05)
+    assert next(claims) == 1
+    b.complete(1)
+    assert list(claims) == []
+    assert b.finished
+
+
+def test_async_claims(tmp_path):
+    a = make_queue(tmp_path, 2, lease_timeout=0.2)
+    b = make_queue(tmp_path, 2, lease_timeout=0.2)
+    assert a.claim() == 0 and a.claim() == 1
+    a.complete(0)
+
+    async def claim_all():
+        claimed = []
+        async for i in b.aclaims(wait=True, poll_interval=0.05):
+            claimed.append(i)
+            b.complete(i)
+        return claimed
+
+    assert asyncio.run(claim_all()) == [1]
+    assert b.finished
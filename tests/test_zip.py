@@ -0,0 +1,87 @@
+import pytest
+
+from gridparse import GridArgumentParser
+from gridparse.grid import ZippedValues
+
+
+@pytest.fixture
+def parser():
+    parser = GridArgumentParser()
+    parser.add_argument("--seed", type=int, searchable=True, default=0)
+    parser.add_argument("--lr", type=float, searchable=True)
+    parser.add_argument("--warmup", type=int, searchable=True, default=10)
+    parser.add_argument("--name", type=str)
+    parser.add_zip_group("--lr", "warmup")
+    return parser
+
+
+def pairs(namespaces):
+    return [(ns.seed, ns.lr, ns.warmup) for ns in namespaces]
+
+
+def test_zipped_values():
+    values = ZippedValues([[1, 2, 3], ["a"], [4, 5, 6]])
+    assert len(values) == 3
+    assert list(values) == [(1, "a", 4), (2, "a", 5), (3, "a", 6)]
+    assert values[-1] == (3, "a", 6)
+    with pytest.raises(ValueError):
+        ZippedValues([[1, 2], [1, 2, 3]])
+
+
+def test_paired_by_position(parser):
+    argv = "--seed 1 2 --lr 0.1 lin:0.2:0.3:2 --warmup 1 2 3".split()
+    grid = parser.parse_grid(argv)
+    assert len(grid) == 2 * 3
+    assert pairs(grid) == [
+        (1, 0.1, 1),
+        (2, 0.1, 1),
+        (1, 0.2, 2),
+        (2, 0.2, 2),
+        (1, 0.3, 3),
+        (2, 0.3, 3),
+    ]
+    assert pairs(parser.parse_args(argv)) == pairs(grid)
+
+
+def test_single_values_and_subspaces(parser):
+    assert pairs(parser.parse_args("--lr 0.1 0.2".split())) == [
+        (0, 0.1, 10),
+        (0, 0.2, 10),
+    ]
+    argv = "--lr 0.1 0.2 { --warmup 5 } { --warmup 6 7 }".split()
+    assert pairs(parser.parse_args(argv)) == [
+        (0, 0.1, 5),
+        (0, 0.2, 5),
+        (0, 0.1, 6),
+        (0, 0.2, 7),
+    ]
+
+
+def test_different_lengths(parser):
+    with pytest.raises(SystemExit):
+        parser.parse_args("--lr 0.1 0.2 --warmup 1 2 3".split())
+    result = parser.compile().parse_one("--lr 0.1 0.2 --warmup 1 2 3".split())
+    assert "different numbers of values" in result.error.message
+
+
+@pytest.mark.parametrize(
+    "args", [("--lr",), ("--lr", "--nope"), ("--lr", "--name"), ("--seed",)]
+)
+def test_invalid_groups(parser, args):
+    with pytest.raises(ValueError):
+        parser.add_zip_group(*args)
+
+
+def test_diff_and_to_argv(parser):
+    diff = parser.diff_grid(
+        "--lr 0.1 0.2 --warmup 1 2".split(),
+        "--lr 0.1 0.2 0.3 --warmup 1 3 3".split(),
+    )
+    assert pairs(diff.added()) == [(0, 0.2, 3), (0, 0.3, 3)]
+    assert pairs(diff.removed()) == [(0, 0.2, 2)]
+
+    namespaces = parser.parse_args("--lr 0.1 0.2 --warmup 1 2".split())
+    assert parser.to_argv_many(namespaces) == [
+        ["--lr", "0.1", "--warmup", "1"],
+        ["--lr", "0.2", "--warmup", "2"],
+    ]